@@ -2,23 +2,36 @@
 Agent léger de lecture titre + abstract pour prioriser une shortlist.
 """
 
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 
-import anthropic
-
+from claude_helper import ANTHROPIC_MODEL
+from claude_helper import OPENAI_MODEL
 from claude_helper import get_anthropic_client
 from claude_helper import get_openai_client
+from reading_prioritization import PRIORITY_ORDER
 from reading_prioritization import priority_rank
+from services.abstract_compression import compress_abstracts
+from services.disk_cache import DiskCache
+from services.disk_cache import get_cache_dir
+from services.llm_cache import cached_llm_call
+from services.llm_hedging import hedged_call
+from services.llm_usage import record_prompt_compression
 
 
 SHORTLIST_MAX_ARTICLES = 10
+# Au-delà de SHORTLIST_MAX_ARTICLES, la shortlist est lue par lots parallèles.
+SHARDED_SHORTLIST_MAX_ARTICLES = 50
+SHARD_SIZE = 8
+SHARD_CONCURRENCY = 4
+SHARD_ATTEMPTS = 2
+# Budgets d'abstract compressé (≈ tokens) par article et par requête envoyée.
+ABSTRACT_TOKEN_BUDGET = 320
+PROMPT_ABSTRACT_TOKEN_BUDGET = 2600
 
-
-def _truncate(text: str, max_chars: int = 1800) -> str:
-    value = str(text or "").strip()
-    if len(value) <= max_chars:
-        return value
-    return value[: max_chars - 3].rstrip() + "..."
+ASSESSMENT_CACHE_TTL = 7 * 24 * 60 * 60
+ASSESSMENT_CACHE = DiskCache(get_cache_dir() / "agent_assessments.sqlite3", max_bytes=16 * 1024 * 1024)
 
 
 def _parse_json(text: str) -> dict:
@@ -42,6 +55,10 @@ def _parse_json(text: str) -> dict:
 
 
 def build_shortlist_for_agent(prioritized: dict, max_articles: int = SHORTLIST_MAX_ARTICLES) -> list:
+    """
+    Shortlist envoyée à l'agent, abstracts complets : ils ne sont compressés qu'au moment
+    de construire la requête, dans le budget du lot qui les porte.
+    """
     articles = prioritized.get("articles", [])
     sorted_articles = sorted(
         articles,
@@ -54,7 +71,7 @@ def build_shortlist_for_agent(prioritized: dict, max_articles: int = SHORTLIST_M
             "article_id": f"A{index}",
             "pmid": article.get("pmid"),
             "title": article.get("title"),
-            "abstract": _truncate(article.get("abstract")),
+            "abstract": str(article.get("abstract") or "").strip(),
             "journal": article.get("journal"),
             "year": article.get("year"),
             "authors": article.get("authors", []),
@@ -62,6 +79,17 @@ def build_shortlist_for_agent(prioritized: dict, max_articles: int = SHORTLIST_M
     return shortlist
 
 
+def _compress_shortlist(shortlist: list, query_text: str) -> tuple:
+    """Abstracts compressés (phrases les plus liées au sujet et à l'objectif) pour une requête."""
+    abstracts, compression = compress_abstracts(
+        shortlist,
+        query_text,
+        per_article_tokens=ABSTRACT_TOKEN_BUDGET,
+        prompt_tokens=PROMPT_ABSTRACT_TOKEN_BUDGET,
+    )
+    return [{**article, "abstract": abstract} for article, abstract in zip(shortlist, abstracts)], compression
+
+
 def _build_agent_prompt(shortlist: list, focus_label: str, custom_goal: str = "") -> str:
     goal_text = custom_goal.strip() or focus_label
     shortlist_json = json.dumps(shortlist, ensure_ascii=False, indent=2)
@@ -98,37 +126,166 @@ Shortlist :
 """.strip()
 
 
-def _assess_with_openai(prompt: str) -> dict:
-    client = get_openai_client()
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        max_tokens=900,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return _parse_json(response.choices[0].message.content)
+def _assess_with_openai(prompt: str, use_cache: bool = True) -> dict:
+    def call() -> dict:
+        client = get_openai_client()
+        response = client.chat.completions.create(
+            model=OPENAI_MODEL,
+            max_tokens=900,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return _parse_json(response.choices[0].message.content)
 
+    return cached_llm_call("abstract_assessment", "openai", OPENAI_MODEL, prompt, 900, call, use_cache=use_cache)
 
-def _assess_with_anthropic(prompt: str) -> dict:
-    client = get_anthropic_client()
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=900,
-        messages=[{"role": "user", "content": prompt}],
+
+def _assess_with_anthropic(prompt: str, use_cache: bool = True) -> dict:
+    def call() -> dict:
+        client = get_anthropic_client()
+        message = client.messages.create(
+            model=ANTHROPIC_MODEL,
+            max_tokens=900,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return _parse_json(message.content[0].text)
+
+    return cached_llm_call("abstract_assessment", "anthropic", ANTHROPIC_MODEL, prompt, 900, call, use_cache=use_cache)
+
+
+def _assess_single(
+    shortlist: list,
+    focus_label: str,
+    custom_goal: str = "",
+    use_cache: bool = True,
+    query_text: str = "",
+) -> dict:
+    compressed, compression = _compress_shortlist(shortlist, query_text)
+    prompt = _build_agent_prompt(compressed, focus_label, custom_goal)
+    record_prompt_compression("abstract_assessment", compression)
+
+    return hedged_call(
+        "openai",
+        lambda: _assess_with_openai(prompt, use_cache=use_cache),
+        "anthropic",
+        lambda: _assess_with_anthropic(prompt, use_cache=use_cache),
     )
-    return _parse_json(message.content[0].text)
 
 
-def assess_shortlist_with_agent(shortlist: list, focus_label: str, custom_goal: str = "") -> dict:
-    prompt = _build_agent_prompt(shortlist, focus_label, custom_goal)
+def _assessment_cache_key(article: dict, goal_text: str) -> str:
+    goal = " ".join(str(goal_text or "").lower().split())
+    content = f"{goal}\0{article.get('title') or ''}\0{article.get('abstract') or ''}"
+    return f"{article.get('pmid') or ''}|{hashlib.sha256(content.encode('utf-8')).hexdigest()}"
 
-    try:
-        return _assess_with_openai(prompt)
-    except Exception:
-        pass
 
-    try:
-        return _assess_with_anthropic(prompt)
-    except anthropic.APIStatusError:
-        raise
-    except Exception:
-        raise
+def _assess_shard(shard: list, focus_label: str, custom_goal: str, use_cache: bool, query_text: str) -> tuple:
+    """
+    Évalue un lot ; une nouvelle tentative ne renvoie que les articles encore sans verdict,
+    sans cache de prompt pour ne pas rejouer une réponse incomplète.
+    """
+    assessed = {}
+    pending = list(shard)
+    last_error = None
+    for attempt in range(SHARD_ATTEMPTS):
+        try:
+            response = _assess_single(
+                pending,
+                focus_label,
+                custom_goal,
+                use_cache=use_cache and attempt == 0,
+                query_text=query_text,
+            )
+        except Exception as error:
+            last_error = error
+            continue
+        pending_ids = {article["article_id"] for article in pending}
+        for item in response.get("articles", []) if isinstance(response, dict) else []:
+            if isinstance(item, dict) and item.get("article_id") in pending_ids:
+                assessed[item["article_id"]] = item
+        pending = [article for article in pending if article["article_id"] not in assessed]
+        if not pending:
+            break
+    return assessed, pending, last_error
+
+
+def _assess_sharded(
+    shortlist: list,
+    focus_label: str,
+    custom_goal: str = "",
+    use_cache: bool = True,
+    query_text: str = "",
+) -> dict:
+    goal_text = custom_goal.strip() or focus_label
+    assessed = {}
+    pending = []
+    for article in shortlist:
+        cached = ASSESSMENT_CACHE.get(_assessment_cache_key(article, goal_text)) if use_cache else None
+        if cached is not None:
+            try:
+                assessed[article["article_id"]] = {**json.loads(cached), "article_id": article["article_id"]}
+                continue
+            except ValueError:
+                pass
+        pending.append(article)
+    cached_count = len(assessed)
+
+    shards = [pending[index:index + SHARD_SIZE] for index in range(0, len(pending), SHARD_SIZE)]
+    articles_by_id = {article["article_id"]: article for article in pending}
+    incomplete_shards = 0
+    last_error = None
+    # Un pool par appel : les sessions concurrentes ne se disputent pas SHARD_CONCURRENCY workers.
+    with ThreadPoolExecutor(max_workers=SHARD_CONCURRENCY, thread_name_prefix="abstract-shard") as executor:
+        futures = [
+            executor.submit(_assess_shard, shard, focus_label, custom_goal, use_cache, query_text)
+            for shard in shards
+        ]
+        for future in futures:
+            shard_assessed, shard_pending, error = future.result()
+            if shard_pending:
+                incomplete_shards += 1
+                last_error = error or last_error
+            for article_id, item in shard_assessed.items():
+                assessed[article_id] = item
+                if item.get("priority") in PRIORITY_ORDER:
+                    ASSESSMENT_CACHE.set(
+                        _assessment_cache_key(articles_by_id[article_id], goal_text),
+                        json.dumps({"priority": item["priority"], "reason": item.get("reason", "")}, ensure_ascii=False),
+                        ASSESSMENT_CACHE_TTL,
+                    )
+
+    if not assessed:
+        raise last_error or ValueError("Aucun article évalué par l'agent.")
+
+    return {
+        "articles": [assessed[article["article_id"]] for article in shortlist if article["article_id"] in assessed],
+        "sharding": {
+            "shards": len(shards),
+            "incomplete_shards": incomplete_shards,
+            "cached_articles": cached_count,
+            "assessed_articles": len(assessed) - cached_count,
+            "unassessed_articles": len(shortlist) - len(assessed),
+        },
+    }
+
+
+def assess_shortlist_with_agent(
+    shortlist: list,
+    focus_label: str,
+    custom_goal: str = "",
+    use_cache: bool = True,
+    sharded: bool | None = None,
+    subject_text: str = "",
+    focus_terms: list | None = None,
+) -> dict:
+    """
+    Une requête unique pour une shortlist courte. Au-delà de SHORTLIST_MAX_ARTICLES (ou
+    sharded=True) : lots de SHARD_SIZE évalués en parallèle, reprise par lot, verdicts mis
+    en cache par article et objectif de lecture. Les abstracts de chaque requête sont
+    compressés autour du sujet, de l'objectif et des termes de l'angle de lecture. Le
+    format renvoyé reste celui qu'attend apply_agent_assessment.
+    """
+    query_text = " ".join([subject_text, custom_goal, focus_label, *(focus_terms or [])])
+    if sharded is None:
+        sharded = len(shortlist or []) > SHORTLIST_MAX_ARTICLES
+    if sharded:
+        return _assess_sharded(shortlist or [], focus_label, custom_goal, use_cache=use_cache, query_text=query_text)
+    return _assess_single(shortlist, focus_label, custom_goal, use_cache=use_cache, query_text=query_text)
@@ -4,6 +4,7 @@ import streamlit as st
 
 from abstract_reader_agent import assess_shortlist_with_agent
 from abstract_reader_agent import build_shortlist_for_agent
+from abstract_reader_agent import SHARDED_SHORTLIST_MAX_ARTICLES
 from concept_editor import apply_editor_changes
 from concept_editor import clone_search_elements
 from concept_editor import EDITOR_STATE_OPTIONS
@@ -35,7 +36,9 @@ from research_projects import save_entry_to_project
 from reading_prioritization import FOCUS_OPTIONS
 from reading_prioritization import apply_agent_assessment
 from services.discovery import discover_articles
+from services.discovery import discovery_max_results
 from services.discovery import run_topic_discovery
+from services.llm_clients import warm_llm_clients
 from services.query_builder import build_query_package
 from services.query_builder import build_query_package_for_elements
 from services.state_manager import load_analysis_entry
@@ -60,10 +63,13 @@ from zotero_integration import ZoteroIntegrationError
 count_geographic_scopes = pubmed_backend.count_geographic_scopes
 fetch_articles = pubmed_backend.fetch_articles
 apply_pubmed_date_filter = pubmed_backend.apply_pubmed_date_filter
+resolve_count = pubmed_backend.resolve_count
+resolve_pubmed_counts = pubmed_backend.resolve_pubmed_counts
 fetch_cited_articles = getattr(pubmed_backend, "fetch_cited_articles", lambda pmid, max_results=12: [])
 
 
 def format_results_count(count) -> str:
+    count = resolve_count(count)
     return str(count) if isinstance(count, int) and count >= 0 else "Résultats indisponibles"
 
 
@@ -684,7 +690,7 @@ def _compute_prioritized_results(
                 query=query,
                 focus_key=focus_key,
                 custom_goal=custom_goal,
-                max_results=50,
+                max_results=discovery_max_results(),
                 time_filter=time_filter,
             )
         st.session_state[cache_key] = cached_payload
@@ -843,7 +849,7 @@ def render_reading_focus(entry: dict, result: dict, bramer: dict) -> None:
         with st.expander("Critères de priorisation", expanded=False):
             st.caption(f"Critères utilisés pour faire remonter un article : {', '.join(focus_terms[:5])}")
 
-    shortlist = build_shortlist_for_agent(prioritized)
+    shortlist = build_shortlist_for_agent(prioritized, max_articles=SHARDED_SHORTLIST_MAX_ARTICLES)
     if shortlist:
         st.caption(
             f"Vous pouvez aussi faire lire une shortlist de {len(shortlist)} articles à un agent pour affiner cette priorisation."
@@ -855,6 +861,8 @@ def render_reading_focus(entry: dict, result: dict, bramer: dict) -> None:
                         shortlist,
                         prioritized.get("focus_label", ""),
                         custom_goal,
+                        subject_text=entry.get("user_question", ""),
+                        focus_terms=prioritized.get("focus_terms"),
                     )
                 prioritized = apply_agent_assessment(prioritized, shortlist, assessment)
                 st.session_state[f"prioritized_articles_{entry.get('id')}"] = prioritized
@@ -1179,6 +1187,7 @@ def render_fake_paywall(entry: dict) -> None:
 
 def render_analysis(entry: dict) -> None:
     result, strategy, bramer = _build_effective_analysis(entry)
+    bramer = resolve_pubmed_counts(bramer)
     question = entry["user_question"]
     time_filter = _get_time_filter_state(entry)
     pack = build_search_strategy_pack(
@@ -1409,6 +1418,7 @@ st.title("Research Companion")
 st.caption("Trouvez les articles scientifiques sur votre sujet.")
 
 get_session_id()
+warm_llm_clients()
 
 with st.sidebar:
     projects = load_projects()
@@ -1450,6 +1460,11 @@ question = st.text_area(
 input_actions = st.columns([1, 1, 5])
 run_analysis = input_actions[0].button("Analyser ma question")
 new_search = input_actions[1].button("Nouvelle recherche")
+force_fresh_analysis = input_actions[2].checkbox(
+    "Forcer une nouvelle analyse",
+    key="force_fresh_analysis",
+    help="Par défaut, une question formulée avec les mêmes termes qu'une question déjà analysée (accents, ordre ou mots outils près) réutilise cette analyse.",
+)
 
 if new_search:
     st.session_state["reset_question_input_pending"] = True
@@ -1465,12 +1480,12 @@ if run_analysis:
                 update_question=False,
             )
             with st.spinner("Analyse du sujet et découverte initiale..."):
-                discovery_payload = run_topic_discovery(question)
+                discovery_payload = run_topic_discovery(question, force_fresh=force_fresh_analysis)
 
             result = discovery_payload.get("result", {})
             query_package = discovery_payload.get("query_package", {})
             strategy = query_package.get("strategy", {})
-            bramer = (query_package.get("platform_outputs") or {}).get("PubMed", {})
+            bramer = resolve_pubmed_counts((query_package.get("platform_outputs") or {}).get("PubMed", {}))
             initial_discovery = discovery_payload.get("discovery", {})
 
             entry = build_history_entry(
@@ -1510,6 +1525,13 @@ if run_analysis:
                     st.session_state[f"prioritized_articles_{entry.get('id')}"] = initial_discovery["prioritized"]
                 st.caption("Le projet n'a pas pu être mis à jour, mais l'analyse reste disponible.")
 
+            analysis_timing = discovery_payload.get("analysis_timing") or {}
+            if analysis_timing.get("mode") == "reused":
+                st.info(
+                    f"Analyse reprise d'une question proche déjà analysée : « {analysis_timing.get('reused_question', '')} ». "
+                    "Cochez « Forcer une nouvelle analyse » pour relancer l'analyse complète."
+                )
+
         except Exception:
             st.error("L'analyse est temporairement indisponible. Veuillez réessayer plus tard.")
     else:
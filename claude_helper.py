@@ -1,14 +1,24 @@
 import anthropic
-import streamlit as st
-import os
 import time
 import json
 from pathlib import Path
-from openai import OpenAI
 from dotenv import load_dotenv
 from prompt_core import PROMPT_CORE
+from prompt_core import PROMPT_REQUEST
 from services.concept_classifier import build_classified_concepts
 from services.concept_classifier import classify_concept_role
+from services.llm_cache import cached_llm_call
+from services.llm_clients import LLM_CLIENTS
+from services.llm_hedging import hedged_call
+from services.llm_hedging import llm_hedging_enabled
+from services.llm_streaming import collect_streamed_json
+from services.llm_streaming import iter_anthropic_text
+from services.llm_streaming import iter_openai_text
+from services.llm_streaming import llm_streaming_enabled
+from services.llm_usage import anthropic_usage
+from services.llm_usage import openai_usage
+from services.llm_usage import record_llm_usage
+from services.single_flight import coalesce
 
 load_dotenv()
 
@@ -17,20 +27,18 @@ load_dotenv()
 # CLIENTS API
 # ═══════════════════════════════════════════════════════════════
 
+ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+OPENAI_MODEL = "gpt-4o"
+
+
 def get_anthropic_client():
-    try:
-        api_key = st.secrets["ANTHROPIC_API_KEY"].strip()
-    except Exception:
-        api_key = os.getenv("ANTHROPIC_API_KEY", "").strip()
-    return anthropic.Anthropic(api_key=api_key)
+    """Client partagé du processus ; recréé seulement si la clé API change."""
+    return LLM_CLIENTS.get("anthropic")
 
 
 def get_openai_client():
-    try:
-        api_key = st.secrets["OPENAI_API_KEY"].strip()
-    except Exception:
-        api_key = os.getenv("OPENAI_API_KEY", "").strip()
-    return OpenAI(api_key=api_key)
+    """Client partagé du processus ; recréé seulement si la clé API change."""
+    return LLM_CLIENTS.get("openai")
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -202,16 +210,88 @@ def select_examples(question: str, intent: str, max_examples: int = 3) -> str:
 # CONSTRUCTION DU PROMPT FINAL
 # ═══════════════════════════════════════════════════════════════
 
-def build_prompt(question: str, intent: str) -> str:
-    """Assemble le prompt core + les exemples dynamiques."""
+# Préfixe statique, identique à chaque appel : mis en cache par le fournisseur.
+SYSTEM_PROMPT = PROMPT_CORE.format()
+
+
+def build_prompt_request(question: str, intent: str) -> str:
+    """Suffixe dynamique : exemples sélectionnés + question + intent."""
     examples_text = select_examples(question, intent, max_examples=3)
-    return PROMPT_CORE.format(
+    return PROMPT_REQUEST.format(
         question=question,
         intent=intent,
         examples=examples_text
     )
 
 
+def build_prompt(question: str, intent: str) -> str:
+    """Prompt complet (préfixe statique + suffixe dynamique), tel que vu par le modèle."""
+    return f"{SYSTEM_PROMPT}\n\n{build_prompt_request(question, intent)}"
+
+
+# ═══════════════════════════════════════════════════════════════
+# APPELS FOURNISSEURS (préfixe en cache, streaming, usage)
+# ═══════════════════════════════════════════════════════════════
+
+def complete_with_anthropic(call_site: str, system_prompt: str, user_prompt: str, max_tokens: int, on_partial=None) -> str:
+    """
+    Le system prompt statique porte un point de cache (cache_control), le message utilisateur
+    ne contient que la partie dynamique. Enregistre tokens en cache / hors cache et TTFT.
+    """
+    client = get_anthropic_client()
+    request = {
+        "model": ANTHROPIC_MODEL,
+        "max_tokens": max_tokens,
+        "system": [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}],
+        "messages": [{"role": "user", "content": user_prompt}],
+    }
+    started = time.monotonic()
+    if not llm_streaming_enabled():
+        message = client.messages.create(**request)
+        record_llm_usage(call_site, "anthropic", anthropic_usage(message.usage), latency_seconds=time.monotonic() - started)
+        return message.content[0].text
+
+    usage = {}
+    text, first_chunk_at = collect_streamed_json(iter_anthropic_text(client, request, usage), on_partial)
+    record_llm_usage(
+        call_site,
+        "anthropic",
+        usage,
+        ttft_seconds=first_chunk_at - started if first_chunk_at else None,
+        latency_seconds=time.monotonic() - started,
+    )
+    return text
+
+
+def complete_with_openai(call_site: str, system_prompt: str, user_prompt: str, max_tokens: int, on_partial=None) -> str:
+    """Même découpage : OpenAI réutilise automatiquement un préfixe system identique."""
+    client = get_openai_client()
+    request = {
+        "model": OPENAI_MODEL,
+        "max_tokens": max_tokens,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+    }
+    started = time.monotonic()
+    if not llm_streaming_enabled():
+        response = client.chat.completions.create(**request)
+        record_llm_usage(call_site, "openai", openai_usage(response.usage), latency_seconds=time.monotonic() - started)
+        return response.choices[0].message.content
+
+    usage = {}
+    text, first_chunk_at = collect_streamed_json(iter_openai_text(client, request, usage), on_partial)
+    record_llm_usage(
+        call_site,
+        "openai",
+        usage,
+        ttft_seconds=first_chunk_at - started if first_chunk_at else None,
+        latency_seconds=time.monotonic() - started,
+    )
+    return text
+
+
 # ═══════════════════════════════════════════════════════════════
 # PARSING RÉPONSE
 # ═══════════════════════════════════════════════════════════════
@@ -676,33 +756,71 @@ def normalize_result(result: dict | None) -> dict:
 # APPELS API
 # ═══════════════════════════════════════════════════════════════
 
-def analyze_with_claude(question: str, intent: str = "") -> dict:
-    client = get_anthropic_client()
-    prompt = build_prompt(question, intent)
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}]
+def analyze_with_claude(question: str, intent: str = "", use_cache: bool = True, on_partial=None) -> dict:
+    request_prompt = build_prompt_request(question, intent)
+
+    def call() -> dict:
+        return parse_response(
+            complete_with_anthropic("analyze_research_question", SYSTEM_PROMPT, request_prompt, 1024, on_partial)
+        )
+
+    payload = cached_llm_call(
+        "analyze_research_question",
+        "anthropic",
+        ANTHROPIC_MODEL,
+        f"{SYSTEM_PROMPT}\n\n{request_prompt}",
+        1024,
+        call,
+        use_cache=use_cache,
     )
-    return normalize_result(parse_response(message.content[0].text))
+    return normalize_result(payload)
 
 
-def analyze_with_openai(question: str, intent: str = "") -> dict:
-    client = get_openai_client()
-    prompt = build_prompt(question, intent)
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}]
+def analyze_with_openai(question: str, intent: str = "", use_cache: bool = True, on_partial=None) -> dict:
+    request_prompt = build_prompt_request(question, intent)
+
+    def call() -> dict:
+        return parse_response(
+            complete_with_openai("analyze_research_question", SYSTEM_PROMPT, request_prompt, 1024, on_partial)
+        )
+
+    payload = cached_llm_call(
+        "analyze_research_question",
+        "openai",
+        OPENAI_MODEL,
+        f"{SYSTEM_PROMPT}\n\n{request_prompt}",
+        1024,
+        call,
+        use_cache=use_cache,
     )
-    return normalize_result(parse_response(response.choices[0].message.content))
+    return normalize_result(payload)
+
+
+def _question_key(question: str, intent: str = "", use_cache: bool = True, on_partial=None) -> str:
+    return f"{intent}|{int(bool(use_cache))}|{' '.join(str(question or '').split())}"
 
 
-def analyze_research_question(question: str, intent: str = "") -> dict:
-    """Essaie Claude, fallback sur OpenAI."""
+@coalesce(name="llm.analyze_research_question", key=_question_key)
+def analyze_research_question(question: str, intent: str = "", use_cache: bool = True, on_partial=None) -> dict:
+    """
+    Claude en premier, OpenAI en secours. En mode hedged, OpenAI démarre dès que Claude
+    échoue ou dépasse son percentile de latence habituel. use_cache=False force un nouvel appel.
+    on_partial(champs, clé) reçoit chaque champ JSON dès qu'il est complet (réponse streamée).
+    """
+    if llm_hedging_enabled():
+        try:
+            return hedged_call(
+                "anthropic",
+                lambda: analyze_with_claude(question, intent, use_cache=use_cache, on_partial=on_partial),
+                "openai",
+                lambda: analyze_with_openai(question, intent, use_cache=use_cache, on_partial=on_partial),
+            )
+        except Exception:
+            raise Exception("Both AI providers are unavailable. Please try again later.")
+
     for attempt in range(2):
         try:
-            return analyze_with_claude(question, intent)
+            return analyze_with_claude(question, intent, use_cache=use_cache, on_partial=on_partial)
         except anthropic.APIStatusError as e:
             if e.status_code == 529 and attempt < 1:
                 time.sleep(3)
@@ -712,7 +830,7 @@ def analyze_research_question(question: str, intent: str = "") -> dict:
             break
 
     try:
-        return analyze_with_openai(question, intent)
+        return analyze_with_openai(question, intent, use_cache=use_cache, on_partial=on_partial)
     except Exception:
         raise Exception("Both AI providers are unavailable. Please try again later.")
 
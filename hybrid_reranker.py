@@ -2,10 +2,17 @@
 Reranking hybride léger pour remonter les articles centraux au sujet exact.
 """
 
-from collections import Counter
+from collections import OrderedDict
 from difflib import SequenceMatcher
+import functools
+import hashlib
 import math
 import re
+import threading
+
+import numpy as np
+
+from platform_backends.article_record import Article
 
 
 STOPWORDS = {
@@ -15,110 +22,322 @@ STOPWORDS = {
     "sont", "and", "or", "of", "in", "on", "to", "by", "de", "du", "la", "le",
 }
 
+FEATURE_CACHE_MAX_ENTRIES = 5000
+SEQUENCE_RATIO_CACHE_SIZE = 20000
+
 
 def _normalize(text: str) -> str:
     return re.sub(r"\s+", " ", str(text or "").strip().lower())
 
 
-def _tokenize(text: str) -> list:
+def tokenize(text: str) -> list:
     tokens = re.findall(r"\b[a-z0-9][a-z0-9\-]{2,}\b", _normalize(text))
     return [token for token in tokens if token not in STOPWORDS]
 
 
-def _token_overlap(anchor_tokens: list, text_tokens: list) -> float:
-    if not anchor_tokens or not text_tokens:
-        return 0.0
-    anchor_set = set(anchor_tokens)
-    text_set = set(text_tokens)
-    return len(anchor_set & text_set) / max(len(anchor_set), 1)
+def _trigram_table(texts: list) -> tuple:
+    """
+    Character-trigram counts for a batch of normalized texts, as flat sparse arrays.
 
+    Returns (article_index, trigram_id, count) with one row per distinct trigram of
+    each text, sorted by article then trigram. Trigram ids pack three code points
+    (21 bits each) into one int64.
+    """
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    empty = np.empty(0, dtype=np.int64)
+    if not len(texts) or not lengths.sum():
+        return empty, empty, empty
 
-def _matching_tokens(anchor_tokens: list, text_tokens: list) -> list:
-    if not anchor_tokens or not text_tokens:
-        return []
-    text_set = set(text_tokens)
-    return [token for token in anchor_tokens if token in text_set]
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    codes = np.concatenate([codes, np.zeros(2, dtype=np.int64)])
+    total = int(lengths.sum())
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    article_index = np.repeat(np.arange(len(texts)), lengths)
+    position = np.arange(total) - np.repeat(starts, lengths)
+    valid = position < np.repeat(lengths - 2, lengths)
 
+    trigram_ids = (codes[:total] << 42) | (codes[1:total + 1] << 21) | codes[2:total + 2]
+    article_index = article_index[valid]
+    trigram_ids = trigram_ids[valid]
+    if not len(trigram_ids):
+        return empty, empty, empty
 
-def _bigram_overlap(anchor_tokens: list, text_tokens: list) -> float:
-    if len(anchor_tokens) < 2 or len(text_tokens) < 2:
-        return 0.0
-    anchor_bigrams = set(zip(anchor_tokens, anchor_tokens[1:]))
-    text_bigrams = set(zip(text_tokens, text_tokens[1:]))
-    if not anchor_bigrams:
-        return 0.0
-    return len(anchor_bigrams & text_bigrams) / len(anchor_bigrams)
+    order = np.lexsort((trigram_ids, article_index))
+    article_index = article_index[order]
+    trigram_ids = trigram_ids[order]
+    boundaries = np.ones(len(trigram_ids), dtype=bool)
+    boundaries[1:] = (article_index[1:] != article_index[:-1]) | (trigram_ids[1:] != trigram_ids[:-1])
+    first = np.flatnonzero(boundaries)
+    counts = np.diff(np.append(first, len(trigram_ids)))
+    return article_index[first], trigram_ids[first], counts
 
 
-def _char_ngram_counter(text: str, n: int = 3) -> Counter:
-    cleaned = re.sub(r"\s+", " ", _normalize(text))
-    if len(cleaned) < n:
-        return Counter()
-    return Counter(cleaned[index:index + n] for index in range(len(cleaned) - n + 1))
+def _batch_cosine(anchor_text: str, features: list) -> np.ndarray:
+    """Cosine similarity between the anchor's trigram vector and every article's cached one, in one pass."""
+    similarities = np.zeros(len(features), dtype=np.float64)
+    _, anchor_ids, anchor_counts = _trigram_table([anchor_text])
+    if not len(anchor_ids) or not features:
+        return similarities
 
+    lengths = np.fromiter((len(item.trigram_ids) for item in features), dtype=np.int64, count=len(features))
+    if not lengths.sum():
+        return similarities
+    article_index = np.repeat(np.arange(len(features)), lengths)
+    trigram_ids = np.concatenate([item.trigram_ids for item in features])
+    counts = np.concatenate([item.trigram_counts for item in features])
+
+    positions = np.minimum(np.searchsorted(anchor_ids, trigram_ids), len(anchor_ids) - 1)
+    shared = anchor_ids[positions] == trigram_ids
+    numerators = np.bincount(
+        article_index[shared],
+        weights=(counts[shared] * anchor_counts[positions[shared]]).astype(np.float64),
+        minlength=len(features),
+    )
+    norms = np.sqrt(np.bincount(article_index, weights=(counts * counts).astype(np.float64), minlength=len(features)))
+    anchor_norm = math.sqrt(float((anchor_counts * anchor_counts).sum()))
+    denominators = anchor_norm * norms
+    np.divide(numerators, denominators, out=similarities, where=(numerators > 0) & (denominators > 0))
+    return similarities
+
+
+class ArticleFeatures:
+    """Text features of one article that do not depend on the subject or the reading focus."""
+
+    __slots__ = (
+        "title",
+        "title_lower",
+        "abstract_lower",
+        "title_token_set",
+        "abstract_token_set",
+        "token_set",
+        "title_bigrams",
+        "trigram_ids",
+        "trigram_counts",
+    )
+
+    def __init__(self, title: str, abstract: str, trigram_ids: np.ndarray, trigram_counts: np.ndarray):
+        title_tokens = tokenize(title)
+        self.title = _normalize(title)
+        self.title_lower = str(title or "").strip().lower()
+        self.abstract_lower = str(abstract or "").strip().lower()
+        self.title_token_set = set(title_tokens)
+        self.abstract_token_set = set(tokenize(abstract))
+        self.token_set = self.title_token_set | self.abstract_token_set
+        self.title_bigrams = set(zip(title_tokens, title_tokens[1:]))
+        self.trigram_ids = trigram_ids
+        self.trigram_counts = trigram_counts
+
+
+def _article_text(article) -> tuple:
+    if isinstance(article, Article):
+        return article.pmid, article.title, article.abstract
+    return article.get("pmid", ""), article.get("title", ""), article.get("abstract", "")
+
+
+class FeatureCache:
+    """LRU of ArticleFeatures keyed by PMID plus a hash of the title and abstract."""
+
+    def __init__(self, max_entries: int = FEATURE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def _key(pmid, title, abstract) -> tuple:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(str(title).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(str(abstract).encode("utf-8"))
+        return str(pmid or ""), digest.hexdigest()
+
+    def get_many(self, articles: list) -> list:
+        texts = [_article_text(article) for article in articles]
+        keys = [self._key(*text) for text in texts]
+        features = [None] * len(articles)
+        with self._lock:
+            for index, key in enumerate(keys):
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._entries.move_to_end(key)
+                    features[index] = cached
+            hits = sum(1 for item in features if item is not None)
+            self._counters["hits"] += hits
+            self._counters["misses"] += len(articles) - hits
+
+        missing = [index for index, item in enumerate(features) if item is None]
+        if not missing:
+            return features
+
+        titles = [texts[index][1] for index in missing]
+        abstracts = [texts[index][2] for index in missing]
+        article_index, trigram_ids, counts = _trigram_table(
+            [_normalize(f"{title} {abstract}".strip()) for title, abstract in zip(titles, abstracts)]
+        )
+        bounds = np.searchsorted(article_index, np.arange(len(missing) + 1))
+        built = {}
+        for offset, index in enumerate(missing):
+            start, end = bounds[offset], bounds[offset + 1]
+            features[index] = ArticleFeatures(titles[offset], abstracts[offset], trigram_ids[start:end].copy(), counts[start:end].copy())
+            built[keys[index]] = features[index]
+
+        with self._lock:
+            for key, item in built.items():
+                self._entries[key] = item
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+        return features
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+        return counters
+
+
+FEATURE_CACHE = FeatureCache()
+
+
+def get_article_features(articles: list) -> list:
+    return FEATURE_CACHE.get_many(list(articles or []))
 
-def _cosine_similarity(counter_a: Counter, counter_b: Counter) -> float:
-    if not counter_a or not counter_b:
-        return 0.0
-    common = set(counter_a) & set(counter_b)
-    numerator = sum(counter_a[key] * counter_b[key] for key in common)
-    denom_a = math.sqrt(sum(value * value for value in counter_a.values()))
-    denom_b = math.sqrt(sum(value * value for value in counter_b.values()))
-    if not denom_a or not denom_b:
-        return 0.0
-    return numerator / (denom_a * denom_b)
 
+def get_feature_cache_stats() -> dict:
+    return FEATURE_CACHE.stats()
 
-def _title_exactness(anchor_text: str, title_text: str, anchor_tokens: list, title_tokens: list) -> float:
-    anchor = _normalize(anchor_text)
-    title = _normalize(title_text)
+
+def _presence_matrix(vocabulary: dict, token_sets: list) -> np.ndarray:
+    """Boolean (articles x vocabulary) matrix marking which vocabulary items each article contains."""
+    matrix = np.zeros((len(token_sets), len(vocabulary)), dtype=bool)
+    if not vocabulary:
+        return matrix
+    for row, tokens in enumerate(token_sets):
+        columns = [vocabulary[token] for token in tokens if token in vocabulary]
+        if columns:
+            matrix[row, columns] = True
+    return matrix
+
+
+def _overlap_ratios(vocabulary: dict, token_sets: list) -> tuple:
+    matrix = _presence_matrix(vocabulary, token_sets)
+    if not vocabulary:
+        return matrix, np.zeros(len(token_sets), dtype=np.float64)
+    return matrix, matrix.sum(axis=1) / len(vocabulary)
+
+
+@functools.lru_cache(maxsize=SEQUENCE_RATIO_CACHE_SIZE)
+def _sequence_ratio(anchor: str, title: str) -> float:
+    """
+    Exact SequenceMatcher ratio. This is not a faster kernel: the first pass costs the same
+    as difflib; only Streamlit reruns, which score the same titles against the same
+    subject, are served from the memo.
+    """
+    return SequenceMatcher(None, anchor, title).ratio()
+
+
+def _title_exactness(anchor: str, anchor_chars: frozenset, title: str, bigram_score: float) -> float:
     if not anchor or not title:
         return 0.0
+    if anchor in title:
+        return 1.0
 
-    phrase_match = 1.0 if anchor in title else 0.0
-    sequence_ratio = SequenceMatcher(None, anchor, title).ratio()
-    bigram_score = _bigram_overlap(anchor_tokens, title_tokens)
-    return max(phrase_match, (sequence_ratio * 0.55) + (bigram_score * 0.45))
+    # Without a shared character SequenceMatcher finds no matching block: its ratio is exactly 0.
+    sequence_ratio = _sequence_ratio(anchor, title) if not anchor_chars.isdisjoint(title) else 0.0
+    return (sequence_ratio * 0.55) + (bigram_score * 0.45)
 
 
-def rerank_articles_hybrid(articles: list, subject_text: str, focus_text: str = "") -> dict:
+def _score_batch(articles: list, anchor_text: str, anchor_tokens: list, focus_tokens: list, features: list = None) -> dict:
+    """Compute every hybrid signal for the whole candidate set with array operations."""
+    if features is None:
+        features = get_article_features(articles)
+
+    anchor_vocabulary = {token: index for index, token in enumerate(dict.fromkeys(anchor_tokens))}
+    title_presence, title_overlap = _overlap_ratios(anchor_vocabulary, [item.title_token_set for item in features])
+    abstract_presence, abstract_overlap = _overlap_ratios(anchor_vocabulary, [item.abstract_token_set for item in features])
+
+    anchor_bigrams = {bigram: index for index, bigram in enumerate(dict.fromkeys(zip(anchor_tokens, anchor_tokens[1:])))}
+    _, title_bigram = _overlap_ratios(anchor_bigrams, [item.title_bigrams for item in features])
+
+    focus_vocabulary = {token: index for index, token in enumerate(dict.fromkeys(focus_tokens))}
+    _, focus_overlap = _overlap_ratios(focus_vocabulary, [item.token_set for item in features])
+
+    anchor_chars = frozenset(anchor_text)
+    exact_title = np.fromiter(
+        (
+            _title_exactness(anchor_text, anchor_chars, title, bigram)
+            for title, bigram in zip((item.title for item in features), title_bigram.tolist())
+        ),
+        dtype=np.float64,
+        count=len(articles),
+    )
+    semantic_similarity = _batch_cosine(anchor_text, features)
+
+    penalty = np.where(
+        (title_overlap < 0.2) & (exact_title < 0.25) & (abstract_overlap < 0.35),
+        0.12,
+        np.where((title_overlap < 0.35) & (exact_title < 0.35) & (abstract_overlap < 0.5), 0.06, 0.0),
+    )
+    hybrid_score = np.maximum(
+        0.0,
+        (exact_title * 0.34) +
+        (title_overlap * 0.26) +
+        (abstract_overlap * 0.16) +
+        (semantic_similarity * 0.18) +
+        (focus_overlap * 0.12) -
+        penalty,
+    )
+
+    anchor_columns = [anchor_vocabulary[token] for token in anchor_tokens]
+    return {
+        "title_matches": [[token for token, column in zip(anchor_tokens, anchor_columns) if row[column]] for row in title_presence],
+        "abstract_matches": [[token for token, column in zip(anchor_tokens, anchor_columns) if row[column]] for row in abstract_presence],
+        "title_overlap": title_overlap.tolist(),
+        "abstract_overlap": abstract_overlap.tolist(),
+        "exact_title": exact_title.tolist(),
+        "semantic_similarity": semantic_similarity.tolist(),
+        "focus_overlap": focus_overlap.tolist(),
+        "penalty": penalty.tolist(),
+        "hybrid_score": hybrid_score.tolist(),
+    }
+
+
+HYBRID_SIGNALS_USED = [
+    "correspondance lexicale",
+    "proximité forte du titre avec le sujet exact",
+    "similarité textuelle globale sujet ↔ titre/abstract",
+    "pénalisation des articles trop généraux",
+]
+
+
+def score_articles_hybrid(articles: list, subject_text: str, focus_text: str = "", features: list = None) -> list:
+    """Hybrid fields (hybrid_score, hybrid_signals, hybrid_reasons) for each article, in input order."""
     anchor_text = _normalize(subject_text)
     focus = _normalize(focus_text)
-    anchor_tokens = _tokenize(anchor_text)
-    focus_tokens = _tokenize(focus)
-    anchor_vector = _char_ngram_counter(anchor_text)
-
-    reranked = []
-    for article in articles or []:
-        title = article.get("title", "")
-        abstract = article.get("abstract", "")
-        title_tokens = _tokenize(title)
-        abstract_tokens = _tokenize(abstract)
-        combined_text = f"{title} {abstract}".strip()
-        title_matches = _matching_tokens(anchor_tokens, title_tokens)
-        abstract_matches = _matching_tokens(anchor_tokens, abstract_tokens)
-
-        title_overlap = _token_overlap(anchor_tokens, title_tokens)
-        abstract_overlap = _token_overlap(anchor_tokens, abstract_tokens)
-        exact_title = _title_exactness(anchor_text, title, anchor_tokens, title_tokens)
-        semantic_similarity = _cosine_similarity(anchor_vector, _char_ngram_counter(combined_text))
-        focus_overlap = _token_overlap(focus_tokens, title_tokens + abstract_tokens) if focus_tokens else 0.0
-
-        penalty = 0.0
-        if title_overlap < 0.2 and exact_title < 0.25 and abstract_overlap < 0.35:
-            penalty += 0.12
-        elif title_overlap < 0.35 and exact_title < 0.35 and abstract_overlap < 0.5:
-            penalty += 0.06
-
-        hybrid_score = (
-            (exact_title * 0.34) +
-            (title_overlap * 0.26) +
-            (abstract_overlap * 0.16) +
-            (semantic_similarity * 0.18) +
-            (focus_overlap * 0.12) -
-            penalty
-        )
-        hybrid_score = max(0.0, hybrid_score)
+    anchor_tokens = tokenize(anchor_text)
+    focus_tokens = tokenize(focus)
+
+    articles = list(articles or [])
+    batch = _score_batch(articles, anchor_text, anchor_tokens, focus_tokens, features)
+
+    scored = []
+    for index in range(len(articles)):
+        title_matches = batch["title_matches"][index]
+        abstract_matches = batch["abstract_matches"][index]
+        title_overlap = batch["title_overlap"][index]
+        abstract_overlap = batch["abstract_overlap"][index]
+        exact_title = batch["exact_title"][index]
+        semantic_similarity = batch["semantic_similarity"][index]
+        focus_overlap = batch["focus_overlap"][index]
+        penalty = batch["penalty"][index]
+        hybrid_score = batch["hybrid_score"][index]
 
         reasons = []
         if exact_title >= 0.72 or (exact_title >= 0.64 and title_overlap >= 0.58):
@@ -138,8 +357,7 @@ def rerank_articles_hybrid(articles: list, subject_text: str, focus_text: str =
         if penalty >= 0.1:
             reasons.append("reste plus général que le sujet exact")
 
-        reranked.append({
-            **article,
+        scored.append({
             "hybrid_score": round(hybrid_score, 4),
             "hybrid_signals": {
                 "title_overlap": round(title_overlap, 4),
@@ -153,22 +371,24 @@ def rerank_articles_hybrid(articles: list, subject_text: str, focus_text: str =
             },
             "hybrid_reasons": reasons,
         })
+    return scored
 
-    reranked = sorted(
-        reranked,
-        key=lambda item: (
-            -item.get("hybrid_score", 0.0),
-            -(int(item["year"]) if str(item.get("year", "")).isdigit() else 0),
-            item.get("title", ""),
-        ),
+
+def hybrid_sort_key(item: dict) -> tuple:
+    return (
+        -item.get("hybrid_score", 0.0),
+        -(int(item["year"]) if str(item.get("year", "")).isdigit() else 0),
+        item.get("title", ""),
     )
 
+
+def rerank_articles_hybrid(articles: list, subject_text: str, focus_text: str = "") -> dict:
+    articles = list(articles or [])
+    reranked = [
+        {**article, **fields}
+        for article, fields in zip(articles, score_articles_hybrid(articles, subject_text, focus_text))
+    ]
     return {
-        "articles": reranked,
-        "signals_used": [
-            "correspondance lexicale",
-            "proximité forte du titre avec le sujet exact",
-            "similarité textuelle globale sujet ↔ titre/abstract",
-            "pénalisation des articles trop généraux",
-        ],
+        "articles": sorted(reranked, key=hybrid_sort_key),
+        "signals_used": list(HYBRID_SIGNALS_USED),
     }
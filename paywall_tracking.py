@@ -9,6 +9,7 @@ from uuid import uuid4
 import requests
 import streamlit as st
 
+from platform_backends.pubmed_backend import resolve_count
 from question_display import get_question_presentation
 
 
@@ -68,8 +69,8 @@ def build_paywall_payload(
         "question_reformulee": entry.get("reformulated_question", ""),
         "type_question": presentation.get("question_type", ""),
         "framework": result.get("framework"),
-        "wide_count": (bramer.get("large") or {}).get("count"),
-        "narrow_count": (bramer.get("strict") or {}).get("count"),
+        "wide_count": resolve_count((bramer.get("large") or {}).get("count")),
+        "narrow_count": resolve_count((bramer.get("strict") or {}).get("count")),
         "is_identical": bramer.get("is_identical"),
         "price_shown": DEFAULT_PRICES,
         "price_selected": price_selected,
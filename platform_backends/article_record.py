@@ -0,0 +1,106 @@
+"""
+Compact PubMed article record: slotted fields, interned repeated strings, read-only dict view.
+"""
+
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+
+PUBMED_ARTICLE_URL = "https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+ARTICLE_FIELDS = (
+    "pmid",
+    "doi",
+    "title",
+    "abstract",
+    "journal",
+    "year",
+    "authors",
+    "keywords",
+    "mesh_terms",
+    "url",
+    "pubmed_rank",
+)
+_ATTRIBUTE_FIELDS = frozenset(ARTICLE_FIELDS) - {"year", "url"}
+_LIST_FIELDS = ("authors", "keywords", "mesh_terms")
+
+
+def intern_strings(values) -> tuple:
+    return tuple(sys.intern(str(value)) for value in (values or ()))
+
+
+def _parse_year(value) -> int | None:
+    text = str(value or "").strip()
+    return int(text) if text.isdigit() else None
+
+
+@dataclass(slots=True, eq=False)
+class Article(Mapping):
+    """
+    One PubMed article. Attributes are typed (year is an int, lists are tuples);
+    item access keeps the historical dict schema (year as text, derived url) so
+    existing `article.get(...)` and `{**article}` readers work unchanged.
+    """
+
+    pmid: str = ""
+    doi: str = ""
+    title: str = ""
+    abstract: str = ""
+    journal: str = ""
+    year: int | None = None
+    authors: tuple = ()
+    keywords: tuple = ()
+    mesh_terms: tuple = ()
+    pubmed_rank: int | None = None
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, data) -> "Article":
+        if isinstance(data, Article):
+            return data
+        extra = {key: value for key, value in data.items() if key not in ARTICLE_FIELDS}
+        return cls(
+            pmid=str(data.get("pmid") or ""),
+            doi=str(data.get("doi") or ""),
+            title=str(data.get("title") or ""),
+            abstract=str(data.get("abstract") or ""),
+            journal=sys.intern(str(data.get("journal") or "")),
+            year=_parse_year(data.get("year")),
+            authors=intern_strings(data.get("authors")),
+            keywords=intern_strings(data.get("keywords")),
+            mesh_terms=intern_strings(data.get("mesh_terms")),
+            pubmed_rank=data.get("pubmed_rank"),
+            extra=extra or None,
+        )
+
+    @property
+    def url(self) -> str:
+        return PUBMED_ARTICLE_URL.format(pmid=self.pmid) if self.pmid else ""
+
+    def __getitem__(self, key):
+        if key == "year":
+            return str(self.year) if self.year is not None else ""
+        if key == "url":
+            return self.url
+        if key in _ATTRIBUTE_FIELDS:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from ARTICLE_FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return len(ARTICLE_FIELDS) + len(self.extra or ())
+
+    def to_dict(self) -> dict:
+        """Plain dict in the historical schema, for the UI, exports and JSON."""
+        data = {key: self[key] for key in ARTICLE_FIELDS}
+        for key in _LIST_FIELDS:
+            data[key] = list(data[key])
+        if self.extra:
+            data.update(self.extra)
+        return data
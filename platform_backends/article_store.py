@@ -0,0 +1,152 @@
+"""
+Local store of parsed PubMed article records, keyed by PMID with DOI as secondary index.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+QUERY_SPECIFIC_FIELDS = ("pubmed_rank",)
+
+
+class ArticleStore:
+    """Records older than max_age are purged; beyond max_bytes the least recently read go first."""
+
+    def __init__(self, path, max_age: float = 30 * 24 * 60 * 60, max_bytes: int = 256 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = None
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                " pmid TEXT PRIMARY KEY,"
+                " doi TEXT,"
+                " record TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " size INTEGER NOT NULL DEFAULT 0,"
+                " accessed_at REAL NOT NULL DEFAULT 0"
+                ")"
+            )
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(articles)")}
+            if "size" not in columns:
+                # Stores created before size-bounded eviction: backfill sizes, treat rows as read when fetched.
+                connection.execute("ALTER TABLE articles ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+                connection.execute("ALTER TABLE articles ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+                connection.execute("UPDATE articles SET size = length(CAST(record AS BLOB)), accessed_at = fetched_at")
+            connection.execute("CREATE INDEX IF NOT EXISTS articles_doi ON articles (doi)")
+            connection.execute("CREATE INDEX IF NOT EXISTS articles_accessed_at ON articles (accessed_at)")
+            connection.execute("CREATE INDEX IF NOT EXISTS articles_fetched_at ON articles (fetched_at)")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get_many(self, pmids: list) -> dict:
+        """Return fresh records for the requested PMIDs; missing or stale ones are left out."""
+        wanted = [str(pmid) for pmid in dict.fromkeys(pmids or []) if pmid]
+        if not wanted:
+            return {}
+
+        now = time.time()
+        oldest = now - self.max_age
+        found = {}
+        with self._lock:
+            try:
+                connection = self._connect()
+                for start in range(0, len(wanted), 500):
+                    chunk = wanted[start:start + 500]
+                    placeholders = ",".join("?" for _ in chunk)
+                    rows = connection.execute(
+                        f"SELECT pmid, record FROM articles WHERE fetched_at >= ? AND pmid IN ({placeholders})",
+                        (oldest, *chunk),
+                    ).fetchall()
+                    for pmid, record in rows:
+                        found[pmid] = json.loads(record)
+                    if rows:
+                        connection.executemany(
+                            "UPDATE articles SET accessed_at = ? WHERE pmid = ?",
+                            [(now, pmid) for pmid, _ in rows],
+                        )
+                connection.commit()
+            except (sqlite3.Error, ValueError):
+                self._counters["errors"] += 1
+            self._counters["hits"] += len(found)
+            self._counters["misses"] += len(wanted) - len(found)
+        return found
+
+    def get_by_doi(self, doi: str) -> dict | None:
+        normalized = str(doi or "").strip().lower()
+        if not normalized:
+            return None
+        with self._lock:
+            try:
+                row = self._connect().execute(
+                    "SELECT record FROM articles WHERE doi = ? AND fetched_at >= ?",
+                    (normalized, time.time() - self.max_age),
+                ).fetchone()
+            except sqlite3.Error:
+                self._counters["errors"] += 1
+                return None
+        return json.loads(row[0]) if row else None
+
+    def put_many(self, articles: list) -> None:
+        now = time.time()
+        rows = []
+        for article in articles or []:
+            pmid = str(article.get("pmid") or "").strip()
+            if not pmid:
+                continue
+            record = {key: value for key, value in article.items() if key not in QUERY_SPECIFIC_FIELDS}
+            doi = str(article.get("doi") or "").strip().lower() or None
+            serialized = json.dumps(record, ensure_ascii=False)
+            rows.append((pmid, doi, serialized, now, len(serialized.encode("utf-8")), now))
+        if not rows:
+            return
+
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.executemany(
+                    "INSERT OR REPLACE INTO articles (pmid, doi, record, fetched_at, size, accessed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._counters["writes"] += len(rows)
+                self._evict(connection, now)
+                connection.commit()
+            except sqlite3.Error:
+                self._counters["errors"] += 1
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        purged = connection.execute("DELETE FROM articles WHERE fetched_at < ?", (now - self.max_age,)).rowcount
+        self._counters["evictions"] += max(purged, 0)
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM articles").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        stale_pmids = []
+        for pmid, size in connection.execute("SELECT pmid, size FROM articles ORDER BY accessed_at ASC"):
+            stale_pmids.append((pmid,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM articles WHERE pmid = ?", stale_pmids)
+        self._counters["evictions"] += len(stale_pmids)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+        return counters
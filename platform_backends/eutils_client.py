@@ -0,0 +1,135 @@
+"""
+Shared E-utilities HTTP client: keep-alive session, NCBI rate limiting and retries.
+"""
+
+import os
+import threading
+import time
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+
+EUTILS_ROOT = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+DEFAULT_TOOL = "research_companion"
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _get_secret(name: str) -> str:
+    try:
+        return st.secrets[name].strip()
+    except Exception:
+        return os.getenv(name, "").strip()
+
+
+class TokenBucket:
+    """Blocking token bucket: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_RATE_LIMITERS = {}
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+
+def _get_rate_limiter(api_key: str) -> TokenBucket:
+    """NCBI limits are per API key (or per IP without one), so limiters are shared process-wide."""
+    with _RATE_LIMITERS_LOCK:
+        limiter = _RATE_LIMITERS.get(api_key)
+        if limiter is None:
+            limiter = TokenBucket(10 if api_key else 3)
+            _RATE_LIMITERS[api_key] = limiter
+        return limiter
+
+
+class EutilsClient:
+    def __init__(
+        self,
+        api_key: str = "",
+        tool: str = DEFAULT_TOOL,
+        email: str = "",
+        timeout: float = 10,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        pool_size: int = 10,
+    ):
+        self.api_key = api_key
+        self.tool = tool
+        self.email = email
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = _get_rate_limiter(api_key)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+
+    def _identify(self, params: dict) -> dict:
+        identified = dict(params or {})
+        if self.api_key:
+            identified["api_key"] = self.api_key
+        if self.tool:
+            identified["tool"] = self.tool
+        if self.email:
+            identified["email"] = self.email
+        return identified
+
+    def _retry_delay(self, attempt: int, response: requests.Response = None) -> float:
+        retry_after = (response.headers.get("Retry-After") if response is not None else "") or ""
+        if retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * (2 ** attempt)
+
+    def get(self, endpoint: str, params: dict) -> requests.Response:
+        """GET an E-utilities endpoint, retrying 429/5xx and transient network errors."""
+        url = f"{EUTILS_ROOT}/{endpoint}.fcgi"
+        identified_params = self._identify(params)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, params=identified_params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+            return response
+
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_eutils_client() -> EutilsClient:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            _CLIENT = EutilsClient(
+                api_key=_get_secret("NCBI_API_KEY"),
+                tool=_get_secret("NCBI_TOOL") or DEFAULT_TOOL,
+                email=_get_secret("NCBI_EMAIL"),
+            )
+        return _CLIENT
@@ -2,108 +2,206 @@
 PubMed backend — translate canonical strategy into PubMed queries.
 """
 
+import io
+import json
 import re
-import requests
+import sys
 import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import as_completed
+
+from platform_backends.article_record import Article
+from platform_backends.article_record import intern_strings
+from platform_backends.article_store import ArticleStore
+from platform_backends.eutils_client import get_eutils_client
+from services.disk_cache import DiskCache
+from services.disk_cache import get_cache_dir
+from services.single_flight import after_flight
+from services.single_flight import coalesce
+
+
+# efetch records are kept per PMID in ARTICLE_STORE rather than per id-list response.
+EUTILS_CACHE_TTLS = {
+    "esearch": 60 * 60,
+    "elink": 7 * 24 * 60 * 60,
+}
+COUNT_MAX_WORKERS = 5
+COUNT_DEADLINE_SECONDS = 20
+BULK_THRESHOLD = 200
+BULK_PAGE_SIZE = 200
+BULK_MAX_RESULTS = 5000
+EUTILS_CACHE = DiskCache(get_cache_dir() / "eutils_cache.sqlite3", max_bytes=256 * 1024 * 1024)
+ARTICLE_STORE = ArticleStore(get_cache_dir() / "articles.sqlite3")
+
+
+def _build_cache_key(endpoint: str, params: dict) -> str:
+    canonical_params = {key: str(value).strip() for key, value in (params or {}).items() if value is not None}
+    return f"{endpoint}?{json.dumps(canonical_params, sort_keys=True, ensure_ascii=False)}"
+
+
+def _eutils_get(endpoint: str, params: dict) -> str | None:
+    """Return the raw E-utilities response body, served from the disk cache when fresh."""
+    ttl = EUTILS_CACHE_TTLS.get(endpoint, 0)
+    cache_key = _build_cache_key(endpoint, params)
+    if ttl:
+        cached = EUTILS_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+    response = get_eutils_client().get(endpoint, params)
+    if response.status_code != 200:
+        return None
+    if ttl:
+        after_flight(EUTILS_CACHE.set, cache_key, response.text, ttl)
+    return response.text
+
+
+def get_eutils_cache_stats() -> dict:
+    return {
+        "responses": EUTILS_CACHE.stats(),
+        "articles": ARTICLE_STORE.stats(),
+    }
 
 
-def _safe_text(element, path: str, default: str = "") -> str:
-    if element is None:
-        return default
-    node = element.find(path)
-    if node is None:
-        return default
-    text = "".join(node.itertext()).strip()
-    return text or default
+def _node_text(node) -> str:
+    return "".join(node.itertext()).strip() if node is not None else ""
 
 
-def _extract_pub_year(article) -> str:
-    journal_issue = article.find(".//JournalIssue/PubDate")
-    if journal_issue is None:
+def _read_pub_year(journal_issue) -> str:
+    pub_date = journal_issue.find("PubDate")
+    if pub_date is None:
         return ""
-
-    year = _safe_text(journal_issue, "Year")
+    year = _node_text(pub_date.find("Year"))
     if year:
         return year
-
-    medline_date = _safe_text(journal_issue, "MedlineDate")
-    if medline_date:
-        return medline_date[:4]
-
-    return ""
+    return _node_text(pub_date.find("MedlineDate"))[:4]
 
 
-def _extract_authors(article) -> list:
-    authors = []
-    for author in article.findall(".//AuthorList/Author"):
-        last_name = _safe_text(author, "LastName")
-        initials = _safe_text(author, "Initials")
-        collective_name = _safe_text(author, "CollectiveName")
-        if collective_name:
-            authors.append(collective_name)
-        elif last_name:
-            authors.append(f"{last_name} {initials}".strip())
-        if len(authors) >= 3:
-            break
-    return authors
-
-
-def _extract_doi(article) -> str:
-    for article_id in article.findall(".//PubmedData/ArticleIdList/ArticleId"):
-        if article_id.attrib.get("IdType") == "doi":
-            text = "".join(article_id.itertext()).strip()
-            if text:
-                return text
+def _read_author(author) -> str:
+    collective_name = _node_text(author.find("CollectiveName"))
+    if collective_name:
+        return collective_name
+    last_name = _node_text(author.find("LastName"))
+    if last_name:
+        return f"{last_name} {_node_text(author.find('Initials'))}".strip()
     return ""
 
 
-def _extract_keywords(article) -> list:
-    keywords = []
-    for keyword in article.findall(".//KeywordList/Keyword"):
-        text = "".join(keyword.itertext()).strip()
-        if text and text not in keywords:
-            keywords.append(text)
-        if len(keywords) >= 8:
-            break
-    return keywords
-
-
-def _extract_mesh_terms(article) -> list:
-    mesh_terms = []
-    for heading in article.findall(".//MeshHeadingList/MeshHeading"):
-        descriptor = _safe_text(heading, "DescriptorName")
-        if descriptor and descriptor not in mesh_terms:
-            mesh_terms.append(descriptor)
-        if len(mesh_terms) >= 8:
-            break
-    return mesh_terms
+def _read_article_node(article_node, record: dict) -> None:
+    for child in article_node:
+        tag = child.tag
+        if tag == "ArticleTitle" and not record["title"]:
+            record["title"] = _node_text(child)
+        elif tag == "Journal":
+            for journal_child in child:
+                if journal_child.tag == "Title" and not record["journal"]:
+                    record["journal"] = _node_text(journal_child)
+                elif journal_child.tag == "JournalIssue" and not record["year"]:
+                    record["year"] = _read_pub_year(journal_child)
+        elif tag == "Abstract":
+            for abstract_text in child.iter("AbstractText"):
+                text = _node_text(abstract_text)
+                if text:
+                    record["abstract_parts"].append(text)
+        elif tag == "AuthorList":
+            for author in child:
+                if len(record["authors"]) >= 3:
+                    break
+                if author.tag != "Author":
+                    continue
+                name = _read_author(author)
+                if name:
+                    record["authors"].append(name)
+
+
+def _build_article_record(article, rank_map: dict = None) -> Article:
+    """Read one PubmedArticle in a single pass over its known children."""
+    record = {
+        "pmid": "",
+        "doi": "",
+        "title": "",
+        "abstract_parts": [],
+        "journal": "",
+        "year": "",
+        "authors": [],
+        "keywords": [],
+        "mesh_terms": [],
+    }
 
+    for section in article:
+        if section.tag == "MedlineCitation":
+            for child in section:
+                tag = child.tag
+                if tag == "PMID" and not record["pmid"]:
+                    record["pmid"] = _node_text(child)
+                elif tag == "Article":
+                    _read_article_node(child, record)
+                elif tag == "KeywordList":
+                    for keyword in child:
+                        text = _node_text(keyword)
+                        if text and text not in record["keywords"] and len(record["keywords"]) < 8:
+                            record["keywords"].append(text)
+                elif tag == "MeshHeadingList":
+                    for heading in child:
+                        descriptor = _node_text(heading.find("DescriptorName"))
+                        if descriptor and descriptor not in record["mesh_terms"] and len(record["mesh_terms"]) < 8:
+                            record["mesh_terms"].append(descriptor)
+        elif section.tag == "PubmedData":
+            for child in section:
+                if child.tag != "ArticleIdList" or record["doi"]:
+                    continue
+                for article_id in child:
+                    if article_id.attrib.get("IdType") == "doi":
+                        text = _node_text(article_id)
+                        if text:
+                            record["doi"] = text
+                            break
+
+    pmid = record["pmid"]
+    year = record["year"]
+    return Article(
+        pmid=pmid,
+        doi=record["doi"],
+        title=record["title"],
+        abstract=" ".join(record["abstract_parts"]),
+        journal=sys.intern(record["journal"]),
+        year=int(year) if year.isdigit() else None,
+        authors=intern_strings(record["authors"]),
+        keywords=intern_strings(record["keywords"]),
+        mesh_terms=intern_strings(record["mesh_terms"]),
+        pubmed_rank=(rank_map or {}).get(pmid),
+    )
+
+
+def iter_pubmed_articles(payload, rank_map: dict = None):
+    """
+    Yield article records from an efetch XML payload as each PubmedArticle closes.
 
-def _parse_pubmed_articles(fetch_root, rank_map: dict = None) -> list:
-    articles = []
-    for article in fetch_root.findall(".//PubmedArticle"):
-        pmid = _safe_text(article, ".//MedlineCitation/PMID")
-        title = _safe_text(article, ".//Article/ArticleTitle")
-        abstract_parts = [
-            "".join(node.itertext()).strip()
-            for node in article.findall(".//Article/Abstract/AbstractText")
-            if "".join(node.itertext()).strip()
-        ]
-        articles.append({
-            "pmid": pmid,
-            "doi": _extract_doi(article),
-            "title": title,
-            "abstract": " ".join(abstract_parts),
-            "journal": _safe_text(article, ".//Journal/Title"),
-            "year": _extract_pub_year(article),
-            "authors": _extract_authors(article),
-            "keywords": _extract_keywords(article),
-            "mesh_terms": _extract_mesh_terms(article),
-            "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else "",
-            "pubmed_rank": (rank_map or {}).get(pmid),
-        })
+    Processed elements are cleared, so memory stays flat regardless of batch size.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    source = io.BytesIO(payload) if isinstance(payload, bytes) else payload
+
+    root = None
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        if root is None:
+            root = element
+            continue
+        if event == "end" and element.tag == "PubmedArticle":
+            yield _build_article_record(element, rank_map)
+            element.clear()
+            root.clear()
+
+
+def _parse_pubmed_articles(source, rank_map: dict = None) -> list:
+    if isinstance(source, ET.Element):
+        articles = [_build_article_record(article, rank_map) for article in source.iter("PubmedArticle")]
+    else:
+        articles = list(iter_pubmed_articles(source, rank_map))
     if rank_map:
-        articles.sort(key=lambda item: (rank_map.get(item.get("pmid"), 999999), item.get("title", "")))
+        articles.sort(key=lambda item: (rank_map.get(item.pmid, 999999), item.title))
     return articles
 
 
@@ -173,6 +271,7 @@ def build_block(label: str, mesh_block: str = None, tiab_term: str = None) -> st
     return ""
 
 
+@coalesce(name="pubmed.count_results", key=lambda query: str(query or "").strip())
 def count_results(query: str) -> int:
     """Return PubMed result count, or -1 if unavailable."""
     try:
@@ -182,103 +281,235 @@ def count_results(query: str) -> int:
             "retmode": "xml",
             "retmax": 0,
         }
-        response = requests.get(
-            "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi",
-            params=params,
-            timeout=10,
-        )
-        if response.status_code != 200:
+        payload = _eutils_get("esearch", params)
+        if payload is None:
             return -1
-        root = ET.fromstring(response.text)
+        root = ET.fromstring(payload)
         count = root.find("Count")
         return int(count.text) if count is not None else -1
     except Exception:
         return -1
 
 
+def count_results_many(
+    queries: list,
+    max_workers: int = COUNT_MAX_WORKERS,
+    deadline: float = COUNT_DEADLINE_SECONDS,
+) -> dict:
+    """Count several queries concurrently; queries unfinished at the deadline map to -1."""
+    unique_queries = [query for query in dict.fromkeys(queries or []) if query]
+    counts = {query: -1 for query in unique_queries}
+    if not unique_queries:
+        return counts
+    if len(unique_queries) == 1:
+        counts[unique_queries[0]] = count_results(unique_queries[0])
+        return counts
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(unique_queries)))
+    futures = {executor.submit(count_results, query): query for query in unique_queries}
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            counts[futures[future]] = future.result()
+    except FuturesTimeoutError:
+        pass
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return counts
+
+
+class LazyCount:
+    """Memoized PubMed count that only reaches E-utilities when first resolved."""
+
+    __slots__ = ("query", "_value")
+
+    def __init__(self, query: str):
+        self.query = query
+        self._value = None
+
+    @property
+    def resolved(self) -> bool:
+        return self._value is not None
+
+    def set(self, value: int) -> None:
+        self._value = value
+
+    def __call__(self) -> int:
+        if self._value is None:
+            self._value = count_results(self.query) if self.query else -1
+        return self._value
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self) -> str:
+        state = self._value if self._value is not None else "pending"
+        return f"LazyCount({state})"
+
+
+def resolve_count(count) -> int:
+    """Return a plain count from either an int or a LazyCount."""
+    if isinstance(count, LazyCount):
+        return count()
+    return count
+
+
+def resolve_pubmed_counts(pubmed_queries: dict, deadline: float = COUNT_DEADLINE_SECONDS) -> dict:
+    """Resolve pending counts concurrently and return a copy holding plain ints (safe to persist)."""
+    pending = [
+        (pubmed_queries.get(key) or {}).get("count")
+        for key in ("large", "strict")
+    ]
+    pending = [count for count in pending if isinstance(count, LazyCount) and not count.resolved]
+    if pending:
+        counts = count_results_many([count.query for count in pending], deadline=deadline)
+        for count in pending:
+            count.set(counts.get(count.query, -1))
+
+    resolved = dict(pubmed_queries or {})
+    for key in ("large", "strict"):
+        if isinstance(resolved.get(key), dict):
+            resolved[key] = {**resolved[key], "count": resolve_count(resolved[key].get("count"))}
+    return resolved
+
+
+def _fetch_article_records(pmids: list, rank_map: dict = None) -> list:
+    """Return parsed records for PMIDs, running efetch only for those missing or stale in the store."""
+    ids = [pmid for pmid in dict.fromkeys(pmids or []) if pmid]
+    records = {pmid: Article.from_dict(record) for pmid, record in ARTICLE_STORE.get_many(ids).items()}
+    missing = [pmid for pmid in ids if pmid not in records]
+
+    if missing:
+        fetch_payload = _eutils_get("efetch", {
+            "db": "pubmed",
+            "id": ",".join(missing),
+            "retmode": "xml",
+        })
+        if fetch_payload is None and not records:
+            return []
+        fetched = _parse_pubmed_articles(fetch_payload) if fetch_payload is not None else []
+        after_flight(ARTICLE_STORE.put_many, fetched)
+        records.update({article.pmid: article for article in fetched if article.pmid})
+
+    articles = []
+    for pmid in ids:
+        article = records.get(pmid)
+        if article is None:
+            continue
+        article.pubmed_rank = (rank_map or {}).get(pmid)
+        articles.append(article)
+    return articles
+
+
+def get_article_by_doi(doi: str) -> Article | None:
+    """Look up a previously fetched article by DOI in the local store."""
+    record = ARTICLE_STORE.get_by_doi(doi)
+    return Article.from_dict(record) if record else None
+
+
+@coalesce(
+    name="pubmed.fetch_articles",
+    key=lambda query, max_results=12: f"{max_results}|{str(query or '').strip()}",
+)
 def fetch_articles(query: str, max_results: int = 12) -> list:
     """Return a lightweight list of PubMed articles for a query."""
     if not query:
         return []
+    if max_results > BULK_THRESHOLD:
+        return fetch_articles_bulk(query, max_results=max_results)
 
     try:
-        search_response = requests.get(
-            "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi",
-            params={
-                "db": "pubmed",
-                "term": query,
-                "retmode": "xml",
-                "retmax": max_results,
-                "sort": "relevance",
-            },
-            timeout=10,
-        )
-        if search_response.status_code != 200:
+        search_payload = _eutils_get("esearch", {
+            "db": "pubmed",
+            "term": query,
+            "retmode": "xml",
+            "retmax": max_results,
+            "sort": "relevance",
+        })
+        if search_payload is None:
             return []
 
-        search_root = ET.fromstring(search_response.text)
+        search_root = ET.fromstring(search_payload)
         ids = [node.text for node in search_root.findall(".//IdList/Id") if node.text]
         if not ids:
             return []
         rank_map = {pmid: index for index, pmid in enumerate(ids, start=1)}
-
-        fetch_response = requests.get(
-            "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi",
-            params={
-                "db": "pubmed",
-                "id": ",".join(ids),
-                "retmode": "xml",
-            },
-            timeout=10,
-        )
-        if fetch_response.status_code != 200:
-            return []
-
-        fetch_root = ET.fromstring(fetch_response.text)
-        return _parse_pubmed_articles(fetch_root, rank_map=rank_map)
+        return _fetch_article_records(ids, rank_map=rank_map)
     except Exception:
         return []
 
 
+def iter_articles_bulk(query: str, max_results: int = 1000, page_size: int = BULK_PAGE_SIZE):
+    """
+    Yield PubMed articles for large result sets, page by page.
+
+    Each page's PMIDs come from a relevance-sorted esearch with retstart/retmax and go
+    through _fetch_article_records, so records already fresh in ARTICLE_STORE are reused
+    and efetch only runs for the missing ones. Pages are yielded as soon as they are ready.
+    """
+    if not query:
+        return
+
+    max_results = min(max(int(max_results or 0), 0), BULK_MAX_RESULTS)
+    page_size = max(1, min(int(page_size or BULK_PAGE_SIZE), 10000))
+
+    limit = max_results
+    retstart = 0
+    while retstart < limit:
+        try:
+            search_payload = _eutils_get("esearch", {
+                "db": "pubmed",
+                "term": query,
+                "retmode": "xml",
+                "retstart": retstart,
+                "retmax": min(page_size, limit - retstart),
+                "sort": "relevance",
+            })
+            if search_payload is None:
+                return
+            search_root = ET.fromstring(search_payload)
+            limit = min(limit, int(search_root.findtext("Count") or 0))
+            ids = [node.text for node in search_root.findall(".//IdList/Id") if node.text]
+            if not ids:
+                return
+            rank_map = {pmid: retstart + offset for offset, pmid in enumerate(ids, start=1)}
+            page = _fetch_article_records(ids, rank_map=rank_map)
+        except Exception:
+            return
+        yield from page
+        retstart += len(ids)
+
+
+def fetch_articles_bulk(query: str, max_results: int = 1000, page_size: int = BULK_PAGE_SIZE) -> list:
+    """Return up to BULK_MAX_RESULTS articles, fetched page by page, in relevance order."""
+    return list(iter_articles_bulk(query, max_results=max_results, page_size=page_size))
+
+
+@coalesce(
+    name="pubmed.fetch_cited_articles",
+    key=lambda pmid, max_results=12: f"{max_results}|{str(pmid or '').strip()}",
+)
 def fetch_cited_articles(pmid: str, max_results: int = 12) -> list:
     """Return a lightweight list of references cited by a PubMed article when available."""
     if not str(pmid or "").strip():
         return []
 
     try:
-        link_response = requests.get(
-            "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/elink.fcgi",
-            params={
-                "dbfrom": "pubmed",
-                "db": "pubmed",
-                "id": str(pmid).strip(),
-                "linkname": "pubmed_pubmed_refs",
-                "retmode": "xml",
-            },
-            timeout=10,
-        )
-        if link_response.status_code != 200:
+        link_payload = _eutils_get("elink", {
+            "dbfrom": "pubmed",
+            "db": "pubmed",
+            "id": str(pmid).strip(),
+            "linkname": "pubmed_pubmed_refs",
+            "retmode": "xml",
+        })
+        if link_payload is None:
             return []
 
-        link_root = ET.fromstring(link_response.text)
+        link_root = ET.fromstring(link_payload)
         linked_ids = [node.text for node in link_root.findall(".//LinkSetDb/Link/Id") if node.text]
         if not linked_ids:
             return []
 
-        fetch_response = requests.get(
-            "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi",
-            params={
-                "db": "pubmed",
-                "id": ",".join(linked_ids[:max_results]),
-                "retmode": "xml",
-            },
-            timeout=10,
-        )
-        if fetch_response.status_code != 200:
-            return []
-
-        fetch_root = ET.fromstring(fetch_response.text)
-        return _parse_pubmed_articles(fetch_root)
+        return _fetch_article_records(linked_ids[:max_results])
     except Exception:
         return []
 
@@ -286,6 +517,8 @@ def fetch_cited_articles(pmid: str, max_results: int = 12) -> list:
 def build_pubmed_queries(strategy: dict) -> dict:
     """
     Translate canonical wide/narrow strategy into PubMed queries.
+
+    Counts are LazyCount handles: building the queries never touches the network.
     """
     wide = strategy.get("wide", {})
     narrow = strategy.get("narrow", {})
@@ -318,19 +551,24 @@ def build_pubmed_queries(strategy: dict) -> dict:
         "large": {
             "query": large_query,
             "elements_used": wide.get("elements_used", []),
-            "count": count_results(large_query),
+            "count": LazyCount(large_query),
         },
         "strict": {
             "query": strict_query,
             "elements_used": narrow.get("elements_used", []),
-            "count": count_results(strict_query),
+            "count": LazyCount(strict_query),
         },
         "excluded": excluded,
         "is_identical": strategy.get("is_identical", False),
     }
 
 
-def count_geographic_scopes(base_query: str, geography: dict, geography_tiab: str = None) -> dict:
+def count_geographic_scopes(
+    base_query: str,
+    geography: dict,
+    geography_tiab: str = None,
+    deadline: float = COUNT_DEADLINE_SECONDS,
+) -> dict:
     """Count PubMed results by geography scope."""
     if not geography:
         return {}
@@ -343,42 +581,37 @@ def count_geographic_scopes(base_query: str, geography: dict, geography_tiab: st
         "global": {
             "label": "Monde entier (sans filtre géographique)",
             "query": base_query,
-            "count": count_results(base_query),
         }
     }
 
     if geography_tiab:
         terms = [t.strip().strip('"') for t in geography_tiab.split(" OR ") if t.strip()]
         geo_blocks = [f'"{t}"[tiab]' for t in terms]
-        query = base_query + f"\nAND ({' OR '.join(geo_blocks)})"
         scopes["geo_filter"] = {
             "label": "Filtre géographique",
-            "query": query,
-            "count": count_results(query),
+            "query": base_query + f"\nAND ({' OR '.join(geo_blocks)})",
         }
 
     if continent:
-        query = base_query + f'\nAND ("{continent}"[tiab])'
         scopes["continent"] = {
             "label": continent,
-            "query": query,
-            "count": count_results(query),
+            "query": base_query + f'\nAND ("{continent}"[tiab])',
         }
 
     if region:
-        query = base_query + f'\nAND ("{region}"[tiab])'
         scopes["region"] = {
             "label": region,
-            "query": query,
-            "count": count_results(query),
+            "query": base_query + f'\nAND ("{region}"[tiab])',
         }
 
     if country:
-        query = base_query + f'\nAND ("{country}"[tiab])'
         scopes["country"] = {
             "label": country,
-            "query": query,
-            "count": count_results(query),
+            "query": base_query + f'\nAND ("{country}"[tiab])',
         }
 
+    counts = count_results_many([scope["query"] for scope in scopes.values()], deadline=deadline)
+    for scope in scopes.values():
+        scope["count"] = counts.get(scope["query"], -1)
+
     return scopes
@@ -5,13 +5,20 @@ Expansion contrôlée de requête à partir d'un petit noyau d'articles.
 import json
 from copy import deepcopy
 
-import anthropic
-
+from claude_helper import ANTHROPIC_MODEL
+from claude_helper import OPENAI_MODEL
 from claude_helper import get_anthropic_client
 from claude_helper import get_openai_client
+from services.abstract_compression import compress_abstracts
+from services.llm_cache import cached_llm_call
+from services.llm_hedging import hedged_call
+from services.llm_usage import record_prompt_compression
 
 
 EXPANSION_SHORTLIST_MAX = 12
+# Budgets d'abstract compressé (≈ tokens) par article et pour toute la shortlist.
+EXPANSION_ABSTRACT_TOKEN_BUDGET = 260
+EXPANSION_PROMPT_ABSTRACT_TOKEN_BUDGET = 3000
 RECOMMENDATION_LABELS = {
     "forte": "Recommandation forte",
     "utile": "Recommandation utile",
@@ -19,13 +26,6 @@ RECOMMENDATION_LABELS = {
 }
 
 
-def _truncate(text: str, max_chars: int = 1400) -> str:
-    value = str(text or "").strip()
-    if len(value) <= max_chars:
-        return value
-    return value[: max_chars - 3].rstrip() + "..."
-
-
 def _parse_json(text: str) -> dict:
     clean = str(text or "").strip()
     if clean.startswith("```json"):
@@ -47,13 +47,14 @@ def _parse_json(text: str) -> dict:
 
 
 def build_expansion_shortlist(articles: list, max_articles: int = EXPANSION_SHORTLIST_MAX) -> list:
+    """Noyau d'articles, abstracts complets : propose_query_expansion les compresse pour sa requête."""
     shortlist = []
     for index, article in enumerate((articles or [])[:max_articles], start=1):
         shortlist.append({
             "article_id": f"E{index}",
             "pmid": article.get("pmid"),
             "title": article.get("title"),
-            "abstract": _truncate(article.get("abstract")),
+            "abstract": str(article.get("abstract") or "").strip(),
             "journal": article.get("journal"),
             "year": article.get("year"),
             "authors": article.get("authors", []),
@@ -61,6 +62,20 @@ def build_expansion_shortlist(articles: list, max_articles: int = EXPANSION_SHOR
     return shortlist
 
 
+def _compress_shortlist(shortlist: list, search_elements: list, user_question: str) -> tuple:
+    """Abstracts compressés autour du sujet et des termes déjà utilisés."""
+    query_text = " ".join(
+        [user_question, *(f"{element.get('label', '')} {element.get('tiab', '')}" for element in (search_elements or []))]
+    )
+    abstracts, compression = compress_abstracts(
+        shortlist,
+        query_text,
+        per_article_tokens=EXPANSION_ABSTRACT_TOKEN_BUDGET,
+        prompt_tokens=EXPANSION_PROMPT_ABSTRACT_TOKEN_BUDGET,
+    )
+    return [{**article, "abstract": abstract} for article, abstract in zip(shortlist, abstracts)], compression
+
+
 def _build_expansion_prompt(shortlist: list, search_elements: list, user_question: str) -> str:
     concept_summary = []
     for element in search_elements or []:
@@ -111,41 +126,43 @@ Shortlist :
 """.strip()
 
 
-def _propose_with_openai(prompt: str) -> dict:
-    client = get_openai_client()
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        max_tokens=1000,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return _parse_json(response.choices[0].message.content)
+def _propose_with_openai(prompt: str, use_cache: bool = True) -> dict:
+    def call() -> dict:
+        client = get_openai_client()
+        response = client.chat.completions.create(
+            model=OPENAI_MODEL,
+            max_tokens=1000,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return _parse_json(response.choices[0].message.content)
 
+    return cached_llm_call("query_expansion", "openai", OPENAI_MODEL, prompt, 1000, call, use_cache=use_cache)
 
-def _propose_with_anthropic(prompt: str) -> dict:
-    client = get_anthropic_client()
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1000,
-        messages=[{"role": "user", "content": prompt}],
-    )
-    return _parse_json(message.content[0].text)
 
+def _propose_with_anthropic(prompt: str, use_cache: bool = True) -> dict:
+    def call() -> dict:
+        client = get_anthropic_client()
+        message = client.messages.create(
+            model=ANTHROPIC_MODEL,
+            max_tokens=1000,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return _parse_json(message.content[0].text)
 
-def propose_query_expansion(shortlist: list, search_elements: list, user_question: str) -> dict:
-    prompt = _build_expansion_prompt(shortlist, search_elements, user_question)
+    return cached_llm_call("query_expansion", "anthropic", ANTHROPIC_MODEL, prompt, 1000, call, use_cache=use_cache)
 
-    try:
-        result = _propose_with_openai(prompt)
-    except Exception:
-        result = None
-
-    if result is None:
-        try:
-            result = _propose_with_anthropic(prompt)
-        except anthropic.APIStatusError:
-            raise
-        except Exception:
-            raise
+
+def propose_query_expansion(shortlist: list, search_elements: list, user_question: str, use_cache: bool = True) -> dict:
+    compressed, compression = _compress_shortlist(shortlist, search_elements, user_question)
+    prompt = _build_expansion_prompt(compressed, search_elements, user_question)
+    record_prompt_compression("query_expansion", compression)
+
+    result = hedged_call(
+        "openai",
+        lambda: _propose_with_openai(prompt, use_cache=use_cache),
+        "anthropic",
+        lambda: _propose_with_anthropic(prompt, use_cache=use_cache),
+    )
 
     allowed_labels = {item.get("label", "Concept") for item in (search_elements or [])}
     proposals = []
@@ -4,7 +4,13 @@ Priorisation légère des articles selon un objectif de lecture.
 
 import re
 
+from hybrid_reranker import HYBRID_SIGNALS_USED
+from hybrid_reranker import get_article_features
+from hybrid_reranker import hybrid_sort_key
+from hybrid_reranker import score_articles_hybrid
+from services.ranking import get_concept_profile
 from services.ranking import score_article_against_detected_concepts
+from services.term_matcher import get_term_matcher
 
 
 FOCUS_OPTIONS = {
@@ -57,15 +63,6 @@ def _extract_goal_terms(custom_goal: str) -> list:
     return list(dict.fromkeys(term for term in terms if term))
 
 
-def _contains_term(text: str, term: str) -> bool:
-    normalized_text = _normalize(text)
-    normalized_term = _normalize(term)
-    if not normalized_text or not normalized_term:
-        return False
-    pattern = r"(?<!\w)" + re.escape(normalized_term) + r"(?!\w)"
-    return re.search(pattern, normalized_text) is not None
-
-
 def priority_rank(priority: str) -> int:
     return PRIORITY_ORDER.get(priority, 9)
 
@@ -103,10 +100,13 @@ def _build_focus_terms(result: dict, focus_key: str, custom_goal: str = "") -> l
     return [term for term in terms if _normalize(term)]
 
 
-def _score_article(article: dict, focus_terms: list, focus_label: str) -> dict:
-    title = _normalize(article.get("title"))
-    abstract = _normalize(article.get("abstract"))
-    haystack = f"{title} {abstract}".strip()
+def _focus_fields(article: dict, focus_terms: list, focus_label: str, features=None) -> dict:
+    if features is not None:
+        title = features.title_lower
+        abstract = features.abstract_lower
+    else:
+        title = _normalize(article.get("title"))
+        abstract = _normalize(article.get("abstract"))
 
     hybrid_score = float(article.get("hybrid_score", 0.0) or 0.0)
     signals = article.get("hybrid_signals", {}) or {}
@@ -144,14 +144,17 @@ def _score_article(article: dict, focus_terms: list, focus_label: str) -> dict:
     if penalty >= 0.1:
         technical_reasons.append("article plus général que le sujet exact")
 
+    focus_matcher = get_term_matcher({"focus": focus_terms})
+    title_terms = focus_matcher.matches(title)
+    abstract_terms = focus_matcher.matches(abstract)
     for term in focus_terms:
         normalized_term = _normalize(term)
         if not normalized_term:
             continue
-        if _contains_term(title, normalized_term):
+        if normalized_term in title_terms:
             score += 3
             matched_terms.append(term)
-        elif _contains_term(abstract, normalized_term):
+        elif normalized_term in abstract_terms:
             score += 2
             matched_terms.append(term)
 
@@ -192,7 +195,6 @@ def _score_article(article: dict, focus_terms: list, focus_label: str) -> dict:
         priority = "À vérifier"
 
     return {
-        **article,
         "score": score,
         "priority": priority,
         "technical_reasons": list(dict.fromkeys(reason for reason in technical_reasons if reason)),
@@ -204,64 +206,121 @@ def _score_article(article: dict, focus_terms: list, focus_label: str) -> dict:
         ),
     }
 
-def prioritize_articles(
-    articles: list,
+def _score_article(article: dict, focus_terms: list, focus_label: str, features=None) -> dict:
+    return {**article, **_focus_fields(article, focus_terms, focus_label, features)}
+
+
+def _priority_sort_key(item: dict) -> tuple:
+    return (
+        priority_rank(item["priority"]),
+        -item.get("score", 0),
+        -item.get("concept_score", 0),
+        -float(item.get("hybrid_score", 0.0) or 0.0),
+        item.get("title", ""),
+    )
+
+
+def _rank_records(
+    records: list,
+    features: list,
     result: dict,
     focus_key: str,
-    custom_goal: str = "",
+    custom_goal: str,
+    concept_profile,
+    sort_key,
 ) -> dict:
+    """Fill focus and concept signals in place on records that already carry their hybrid fields, then sort once."""
     focus_label = custom_goal.strip() or FOCUS_OPTIONS.get(focus_key, FOCUS_OPTIONS["other"])
     focus_terms = _build_focus_terms(result, focus_key, custom_goal)
-
-    ranked = []
-    for article in articles:
-        scored_article = _score_article(article, focus_terms, focus_label)
-        concept_match = score_article_against_detected_concepts(scored_article, result)
-        ranked.append({
-            **scored_article,
-            "score": scored_article.get("score", 0) + concept_match.get("concept_score", 0),
-            "reasons": concept_match.get("reasons", []),
-            "matched_concepts": concept_match.get("matched_by_role", {}),
-            "concept_score": concept_match.get("concept_score", 0),
-        })
-
-    ranked.sort(
-        key=lambda item: (
-            priority_rank(item["priority"]),
-            -item.get("score", 0),
-            -item.get("concept_score", 0),
-            -float(item.get("hybrid_score", 0.0) or 0.0),
-            item.get("title", ""),
-        )
-    )
-
-    ranked_with_positions = []
-    for app_rank, article in enumerate(ranked, start=1):
-        pubmed_rank = article.get("pubmed_rank")
-        rank_delta = None
-        if isinstance(pubmed_rank, int):
-            rank_delta = pubmed_rank - app_rank
-        ranked_with_positions.append({
-            **article,
-            "app_rank": app_rank,
-            "rank_delta": rank_delta,
-        })
+    concept_profile = concept_profile or get_concept_profile(result)
+
+    for record, record_features in zip(records, features):
+        record.update(_focus_fields(record, focus_terms, focus_label, record_features))
+        concept_match = score_article_against_detected_concepts(record, profile=concept_profile)
+        record["score"] = record.get("score", 0) + concept_match.get("concept_score", 0)
+        record["reasons"] = concept_match.get("reasons", [])
+        record["matched_concepts"] = concept_match.get("matched_by_role", {})
+        record["concept_score"] = concept_match.get("concept_score", 0)
+
+    records.sort(key=sort_key)
+    for app_rank, record in enumerate(records, start=1):
+        pubmed_rank = record.get("pubmed_rank")
+        record["app_rank"] = app_rank
+        record["rank_delta"] = pubmed_rank - app_rank if isinstance(pubmed_rank, int) else None
 
     return {
         "focus_key": focus_key,
         "focus_label": focus_label,
         "focus_terms": focus_terms,
-        "articles": ranked_with_positions,
+        "articles": records,
         "display_articles": [
-            article
-            for article in ranked_with_positions
-            if article.get("priority") != "À vérifier"
-            or float(article.get("hybrid_score", 0.0) or 0.0) >= 0.18
-            or article.get("score", 0) >= 1.8
+            record
+            for record in records
+            if record.get("priority") != "À vérifier"
+            or float(record.get("hybrid_score", 0.0) or 0.0) >= 0.18
+            or record.get("score", 0) >= 1.8
         ],
     }
 
 
+def prioritize_articles(
+    articles: list,
+    result: dict,
+    focus_key: str,
+    custom_goal: str = "",
+    concept_profile=None,
+) -> dict:
+    # Text features are cached per article and concepts per result, so a focus or goal change only re-scores.
+    articles = list(articles or [])
+    return _rank_records(
+        [dict(article) for article in articles],
+        get_article_features(articles),
+        result,
+        focus_key,
+        custom_goal,
+        concept_profile,
+        _priority_sort_key,
+    )
+
+
+def rank_articles_for_reading(
+    articles: list,
+    subject_text: str,
+    result: dict,
+    focus_key: str,
+    custom_goal: str = "",
+    concept_profile=None,
+) -> dict:
+    """
+    Fused equivalent of rerank_articles_hybrid followed by prioritize_articles.
+
+    Each article is copied once into a record that receives the hybrid, focus and
+    concept fields in place, and the records are sorted once. Ties keep the order
+    the two-stage pipeline produced. "reranking" shares the same records, in hybrid order.
+    """
+    articles = list(articles or [])
+    features = get_article_features(articles)
+    records = [
+        {**article, **fields}
+        for article, fields in zip(articles, score_articles_hybrid(articles, subject_text, custom_goal, features))
+    ]
+    reranked = sorted(records, key=hybrid_sort_key)
+    prioritized = _rank_records(
+        records,
+        features,
+        result,
+        focus_key,
+        custom_goal,
+        concept_profile,
+        lambda item: (*_priority_sort_key(item), *hybrid_sort_key(item)[1:]),
+    )
+    prioritized["reranking"] = {
+        "articles": reranked,
+        "signals_used": list(HYBRID_SIGNALS_USED),
+    }
+    return prioritized
+
+
 def apply_agent_assessment(prioritized: dict, shortlist: list, assessment: dict) -> dict:
     assessment_items = assessment.get("articles", []) if isinstance(assessment, dict) else []
     assessment_by_id = {
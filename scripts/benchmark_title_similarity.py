@@ -0,0 +1,174 @@
+"""
+Parity check and timings for hybrid_reranker's title exactness (exact SequenceMatcher
+ratio, memoized per subject and title).
+
+Parity compares the full ranked output (order, scores, signals, reasons and reading
+priority) against a plain SequenceMatcher reference.
+"""
+
+import json
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from unittest.mock import patch
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from hybrid_reranker import _normalize
+from hybrid_reranker import _sequence_ratio
+from hybrid_reranker import rerank_articles_hybrid
+from reading_prioritization import rank_articles_for_reading
+
+
+SUBJECT = "prévalence du diabète chez les enfants au Mali diabetes prevalence children"
+FOCUS = "facteurs de risque en milieu rural"
+
+FIXTURE_TITLES = [
+    "Prévalence du diabète chez les enfants au Mali",
+    "Prevalence of type 1 diabetes among children in Mali: a hospital-based study",
+    "Diabetes prevalence in West African children and adolescents",
+    "Type 2 diabetes in adults: a global systematic review",
+    "Risk factors for gestational diabetes in rural Burkina Faso",
+    "Épidémiologie du diabète de type 1 en Afrique de l'Ouest",
+    "Malaria prevalence among children under five in Mali",
+    "Glycemic control and HbA1c in self-management programmes",
+    "Obesity and insulin resistance in urban adolescents",
+    "Childhood diabetes care in sub-Saharan Africa: barriers and opportunities",
+    "A cohort study of diabetic ketoacidosis at diagnosis in Bamako",
+    "Nutrition transition and cardiometabolic risk in Sahel countries",
+]
+
+VOCABULARY = (
+    "diabetes prevalence mali children type adults risk factors west africa hospital cohort "
+    "insulin glucose obesity rural urban épidémiologie prévalence 2019 self-management hba1c"
+).split()
+
+
+PROJECTS_PATH = PROJECT_ROOT / "projects.json"
+
+
+def _reference_title_exactness(anchor, anchor_chars, title_text, bigram_score):
+    title = _normalize(title_text)
+    if not anchor or not title:
+        return 0.0
+    if anchor in title:
+        return 1.0
+    sequence_ratio = SequenceMatcher(None, anchor, title).ratio()
+    return (sequence_ratio * 0.55) + (bigram_score * 0.45)
+
+
+def _build_fixtures(seed=7, size=1500):
+    rng = random.Random(seed)
+
+    def sentence(length):
+        return " ".join(rng.choice(VOCABULARY) for _ in range(length))
+
+    articles = [
+        {"pmid": f"f{index}", "title": title, "abstract": f"{title}. {sentence(60)}", "year": "2021"}
+        for index, title in enumerate(FIXTURE_TITLES)
+    ]
+    articles.extend(
+        {"pmid": str(index), "title": sentence(rng.randint(0, 14)), "abstract": sentence(rng.randint(0, 200))}
+        for index in range(size)
+    )
+    return articles
+
+
+def _ranked(result):
+    return [
+        (
+            article["pmid"],
+            article["hybrid_score"],
+            json.dumps(article["hybrid_signals"], sort_keys=True),
+            tuple(article["hybrid_reasons"]),
+            article.get("priority"),
+        )
+        for article in result["articles"]
+    ]
+
+
+def _assert_same_ranking(label, run):
+    _sequence_ratio.cache_clear()
+    fast = _ranked(run())
+    with patch("hybrid_reranker._title_exactness", _reference_title_exactness):
+        reference = _ranked(run())
+    if fast != reference:
+        first = next(index for index, pair in enumerate(zip(fast, reference)) if pair[0] != pair[1])
+        raise AssertionError(f"{label}: ranked output differs from position {first}: {fast[first]} != {reference[first]}")
+
+
+def _saved_entries():
+    try:
+        projects = json.loads(PROJECTS_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    return [
+        entry
+        for project in projects
+        for entry in project.get("entries", []) or []
+        if entry.get("user_question") and isinstance(entry.get("result"), dict)
+    ]
+
+
+def check_parity(articles):
+    for focus in ("", FOCUS):
+        _assert_same_ranking(f"rerank (focus={focus!r})", lambda: rerank_articles_hybrid(articles, SUBJECT, focus))
+        _assert_same_ranking(f"rerank 50 (focus={focus!r})", lambda: rerank_articles_hybrid(articles[:50], SUBJECT, focus))
+    print(f"Parité du classement complet : OK ({len(articles)} articles, avec et sans angle)")
+
+    entries = _saved_entries()
+    for entry in entries:
+        question = entry["user_question"]
+        _assert_same_ranking(
+            f"lecture {question!r}",
+            lambda: rank_articles_for_reading(articles, question, entry["result"], "other"),
+        )
+    print(f"Parité du classement de lecture (ordre et priorités) : OK ({len(entries)} questions enregistrées)")
+
+
+def _time(callable_, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        callable_()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def benchmark(articles):
+    anchor = _normalize(SUBJECT)
+    titles = [_normalize(article["title"]) for article in articles if article["title"]]
+
+    sequence_time = _time(lambda: [SequenceMatcher(None, anchor, title).ratio() for title in titles])
+    _sequence_ratio.cache_clear()
+    [_sequence_ratio(anchor, title) for title in titles]
+    memoized_time = _time(lambda: [_sequence_ratio(anchor, title) for title in titles])
+    print(
+        f"Ratio par paire : SequenceMatcher {sequence_time / len(titles) * 1e6:.1f} µs, "
+        f"lecture du mémo au rerun {memoized_time / len(titles) * 1e6:.1f} µs"
+    )
+
+    _sequence_ratio.cache_clear()
+    cold_time = _time(lambda: (_sequence_ratio.cache_clear(), rerank_articles_hybrid(articles, SUBJECT, FOCUS)), repeat=3)
+    warm_time = _time(lambda: rerank_articles_hybrid(articles, SUBJECT, FOCUS), repeat=3)
+    with patch("hybrid_reranker._title_exactness", _reference_title_exactness):
+        reference_time = _time(lambda: rerank_articles_hybrid(articles, SUBJECT, FOCUS), repeat=3)
+    print(
+        f"Reranking complet ({len(articles)} articles) : référence {reference_time * 1000:.0f} ms, "
+        f"premier passage (sans mémo, même coût) {cold_time * 1000:.0f} ms, rerun mémoïsé {warm_time * 1000:.0f} ms"
+    )
+
+
+def main():
+    articles = _build_fixtures()
+    check_parity(articles)
+    benchmark(articles)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Extractive abstract compression under token budgets: keep the sentences that matter
+for the query, drop boilerplate, stay in the original order.
+"""
+
+import re
+
+from hybrid_reranker import get_article_features
+from hybrid_reranker import tokenize
+
+
+# Rough size of a token for English/French scientific prose; no tokenizer dependency.
+CHARS_PER_TOKEN = 4
+ELLIPSIS = " […] "
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9À-Ý(\[])")
+_BOILERPLATE = re.compile(
+    r"copyright|©|all rights reserved|published by|trial registration|clinicaltrials\.gov|"
+    r"prospero|funding|conflicts? of interest|this article is protected",
+    re.IGNORECASE,
+)
+_RESULT_CUE = re.compile(
+    r"\d+(?:[.,]\d+)?\s?%|\bp\s?[<=>]|95\s?%|"
+    r"\bsignificant|\bassociated\b|\bprevalence\b|\bincidence\b|\bconclu|\bsuggest",
+    re.IGNORECASE,
+)
+# Effect-size abbreviations match case-sensitively: lowercase "or" / "ci" are ordinary words.
+_EFFECT_SIZE_CUE = re.compile(r"\b(?:CI|OR|aOR|HR|aHR|RR|IRR)\b")
+
+
+def estimate_tokens(text: str) -> int:
+    value = str(text or "")
+    return (len(value) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[: max(0, max_chars - 3)].rstrip() + "..."
+
+
+def split_sentences(text: str) -> list:
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(str(text or "").strip()) if sentence.strip()]
+
+
+def _sentence_score(index: int, sentence: str, query_tokens: set, title_tokens: set) -> float:
+    if _BOILERPLATE.search(sentence):
+        return -1.0
+    tokens = set(tokenize(sentence))
+    if not tokens:
+        return 0.0
+    score = (2.0 * len(tokens & query_tokens) + len(tokens & title_tokens)) / (len(tokens) ** 0.5)
+    if _RESULT_CUE.search(sentence) or _EFFECT_SIZE_CUE.search(sentence):
+        score += 1.0
+    if index == 0:
+        # The opening sentence usually states the objective or context.
+        score += 0.5
+    return score
+
+
+def compress_abstract(abstract: str, max_tokens: int, query_tokens: set = frozenset(), title_tokens: set = frozenset()) -> str:
+    """
+    Abstract within max_tokens: unchanged if it already fits, otherwise the best-scoring
+    sentences (query terms, title terms, result/conclusion cues) in their original order.
+    """
+    text = str(abstract or "").strip()
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sentences = split_sentences(text)
+    ranked = sorted(
+        range(len(sentences)),
+        key=lambda index: (-_sentence_score(index, sentences[index], query_tokens, title_tokens), index),
+    )
+    kept = set()
+    used = 0
+    for index in ranked:
+        if _BOILERPLATE.search(sentences[index]):
+            continue
+        cost = estimate_tokens(sentences[index]) + (estimate_tokens(ELLIPSIS) if kept else 0)
+        if used + cost > max_tokens:
+            continue
+        kept.add(index)
+        used += cost
+
+    if not kept:
+        return _truncate_to_tokens(text, max_tokens)
+
+    parts = []
+    previous = -1
+    for index in sorted(kept):
+        if parts:
+            parts.append(ELLIPSIS if index != previous + 1 else " ")
+        parts.append(sentences[index])
+        previous = index
+    return "".join(parts)
+
+
+def compress_abstracts(
+    articles: list,
+    query_text: str = "",
+    per_article_tokens: int = 300,
+    prompt_tokens: int = 3000,
+    prompt_size: int | None = None,
+) -> tuple:
+    """
+    Compress the abstracts of articles for one prompt.
+
+    Each abstract gets min(per_article_tokens, prompt_tokens / prompt_size) tokens, where
+    prompt_size is the number of articles sent together (all of them by default). Title
+    tokens come from the reranker's cached article features. Returns the compressed
+    abstracts and {original_tokens, compressed_tokens, tokens_saved}.
+    """
+    articles = list(articles or [])
+    if not articles:
+        return [], {"original_tokens": 0, "compressed_tokens": 0, "tokens_saved": 0}
+
+    budget = min(per_article_tokens, max(1, prompt_tokens // max(1, min(prompt_size or len(articles), len(articles)))))
+    query_tokens = set(tokenize(query_text))
+    features = get_article_features(articles)
+
+    compressed = []
+    original_tokens = 0
+    compressed_tokens = 0
+    for article, feature in zip(articles, features):
+        abstract = str(article.get("abstract") or "").strip()
+        text = compress_abstract(abstract, budget, query_tokens, feature.title_token_set)
+        compressed.append(text)
+        original_tokens += estimate_tokens(abstract)
+        compressed_tokens += estimate_tokens(text)
+
+    return compressed, {
+        "original_tokens": original_tokens,
+        "compressed_tokens": compressed_tokens,
+        "tokens_saved": original_tokens - compressed_tokens,
+    }
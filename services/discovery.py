@@ -1,11 +1,169 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
 from claude_helper import analyze_research_question
-from hybrid_reranker import rerank_articles_hybrid
+from claude_helper import normalize_result
 from platform_backends import pubmed_backend
-from reading_prioritization import prioritize_articles
+from reading_prioritization import rank_articles_for_reading
+from services.librarian_strategy_adapter import adapt_librarian_strategy_payload
 from services.librarian_strategy_adapter import get_librarian_strategy_analysis
 from services.query_builder import build_fallback_query_attempts
 from services.query_builder import build_query_package
 from services.query_builder import get_preferred_discovery_query
+from services.question_index import find_similar_analysis
+
+
+SPECULATIVE_LIBRARIAN_DEADLINE = 25
+DEFAULT_DISCOVERY_MAX_RESULTS = 50
+
+
+def discovery_max_results() -> int:
+    """
+    Candidates fetched for the initial discovery. Above pubmed_backend.BULK_THRESHOLD,
+    fetch_articles switches to paged bulk retrieval (up to BULK_MAX_RESULTS).
+    """
+    try:
+        value = int(os.getenv("RESEARCH_COMPANION_DISCOVERY_MAX_RESULTS", DEFAULT_DISCOVERY_MAX_RESULTS))
+    except ValueError:
+        return DEFAULT_DISCOVERY_MAX_RESULTS
+    return min(max(value, 1), pubmed_backend.BULK_MAX_RESULTS)
+
+
+def _run_in_thread(name: str, fn, *args, **kwargs) -> Future:
+    """
+    Run fn on its own daemon thread and return a Future once it has started. Each
+    discovery gets its own threads, so concurrent sessions never queue behind a shared pool.
+    """
+    future = Future()
+    started = threading.Event()
+
+    def run() -> None:
+        started.set()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as error:
+            future.set_exception(error)
+
+    threading.Thread(target=run, name=name, daemon=True).start()
+    started.wait()
+    return future
+
+
+def _timed_call(fn, *args, **kwargs) -> tuple:
+    started = time.monotonic()
+    value = fn(*args, **kwargs)
+    return value, time.monotonic() - started
+
+
+class DiscoveryPrefetcher:
+    """
+    Starts the PubMed count and first fetch of a discovery query as soon as a streamed
+    analysis has produced it. count_results and fetch_articles are coalesced and disk-cached,
+    so discover_articles later joins the in-flight request or reads the warm cache.
+    """
+
+    def __init__(self, question: str, max_results: int | None = None, time_filter: dict | None = None):
+        self.question = question
+        self.max_results = max_results or discovery_max_results()
+        self.time_filter = _normalize_time_filter(time_filter)
+        self.prefetched = []
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+
+    def _prefetch(self, source: str, query_package: dict) -> None:
+        query = pubmed_backend.apply_pubmed_date_filter(
+            get_preferred_discovery_query(query_package),
+            start_year=self.time_filter.get("start_year", ""),
+            end_year=self.time_filter.get("end_year", ""),
+        )
+        if not query:
+            return
+        with self._lock:
+            if any(item["query"] == query for item in self.prefetched):
+                return
+            self.prefetched.append(
+                {"source": source, "query": query, "started_after_seconds": round(time.monotonic() - self._started, 3)}
+            )
+        _run_in_thread("pubmed-prefetch-count", pubmed_backend.count_results, query)
+        _run_in_thread("pubmed-prefetch-fetch", pubmed_backend.fetch_articles, query, self.max_results)
+
+    def on_librarian_field(self, fields: dict, key: str) -> None:
+        if key != "broad_query":
+            return
+        analysis = adapt_librarian_strategy_payload(self.question, fields)
+        if analysis:
+            self._prefetch("librarian_strategy", analysis.get("query_package") or {})
+
+    def on_legacy_field(self, fields: dict, key: str) -> None:
+        # search_elements is the last field that shapes the query; research_level only follows it.
+        if key != "search_elements":
+            return
+        self._prefetch("legacy", build_query_package(normalize_result(fields)))
+
+
+def _analyze_speculatively(
+    question: str,
+    deadline: float,
+    prefetcher: DiscoveryPrefetcher | None = None,
+    use_cache: bool = True,
+) -> tuple:
+    """
+    Start the librarian and legacy analyses together. The librarian result wins when it
+    arrives valid within `deadline`, counted from when its call started; otherwise the
+    legacy result, already in flight, is used.
+    """
+    started = time.monotonic()
+    librarian_future = _run_in_thread(
+        "topic-analysis-librarian",
+        _timed_call,
+        get_librarian_strategy_analysis,
+        question,
+        use_cache=use_cache,
+        on_partial=prefetcher.on_librarian_field if prefetcher else None,
+    )
+    librarian_started = time.monotonic()
+    legacy_future = _run_in_thread(
+        "topic-analysis-legacy",
+        _timed_call,
+        analyze_research_question,
+        question,
+        use_cache=use_cache,
+        on_partial=prefetcher.on_legacy_field if prefetcher else None,
+    )
+
+    librarian_analysis = None
+    librarian_seconds = None
+    try:
+        librarian_analysis, librarian_seconds = librarian_future.result(
+            timeout=max(0.0, deadline - (time.monotonic() - librarian_started))
+        )
+    except FuturesTimeoutError:
+        pass
+
+    timing = {
+        "mode": "speculative",
+        "deadline_seconds": deadline,
+        "librarian_seconds": round(librarian_seconds, 3) if librarian_seconds is not None else None,
+        "librarian_timed_out": librarian_seconds is None,
+        "legacy_seconds": None,
+        "time_saved_seconds": 0.0,
+    }
+    if librarian_analysis:
+        timing["wall_seconds"] = round(time.monotonic() - started, 3)
+        return librarian_analysis, None, timing
+
+    legacy_result, legacy_seconds = legacy_future.result()
+    wall_seconds = time.monotonic() - started
+    # Sequentially the legacy call would only have started after the librarian gave up.
+    sequential_seconds = (librarian_seconds if librarian_seconds is not None else deadline) + legacy_seconds
+    timing["legacy_seconds"] = round(legacy_seconds, 3)
+    timing["wall_seconds"] = round(wall_seconds, 3)
+    timing["time_saved_seconds"] = round(max(0.0, sequential_seconds - wall_seconds), 3)
+    return None, legacy_result, timing
 
 
 def _normalize_time_filter(time_filter: dict | None = None) -> dict:
@@ -27,9 +185,10 @@ def discover_articles(
     query: str,
     focus_key: str = "other",
     custom_goal: str = "",
-    max_results: int = 50,
+    max_results: int | None = None,
     time_filter: dict | None = None,
 ) -> dict:
+    max_results = max_results or discovery_max_results()
     normalized_time_filter = _normalize_time_filter(time_filter)
     attempts = build_fallback_query_attempts(result or {})
     if query:
@@ -44,13 +203,26 @@ def discover_articles(
     filtered_query = ""
     articles = []
 
+    candidates = []
     for attempt in attempts or [selected_attempt]:
         candidate_query = pubmed_backend.apply_pubmed_date_filter(
             attempt.get("query", ""),
             start_year=normalized_time_filter.get("start_year", ""),
             end_year=normalized_time_filter.get("end_year", ""),
         )
-        if not candidate_query:
+        if candidate_query:
+            candidates.append((attempt, candidate_query))
+
+    # Probe every relaxation step with retmax=0 counts at once, then fetch only the first non-empty one.
+    # Unavailable counts (-1) still get a fetch so a failed probe never hides results.
+    probe_counts = pubmed_backend.count_results_many([candidate_query for _, candidate_query in candidates])
+
+    for attempt, candidate_query in candidates:
+        count = probe_counts.get(candidate_query, -1)
+        if not filtered_query:
+            filtered_query = candidate_query
+            selected_attempt = attempt
+        if count == 0:
             continue
         candidate_articles = pubmed_backend.fetch_articles(candidate_query, max_results=max_results)
         if candidate_articles:
@@ -58,21 +230,17 @@ def discover_articles(
             articles = candidate_articles
             selected_attempt = attempt
             break
-        if not filtered_query:
-            filtered_query = candidate_query
-            selected_attempt = attempt
 
-    reranked = rerank_articles_hybrid(
-        articles or [],
-        question,
-        custom_goal,
-    )
-    prioritized = prioritize_articles(reranked.get("articles", []), result or {}, focus_key, custom_goal)
+    prioritized = rank_articles_for_reading(articles or [], question, result or {}, focus_key, custom_goal)
     prioritized["time_filter"] = normalized_time_filter
-    prioritized["reranking"] = reranked
     prioritized["discovery_query"] = filtered_query
     prioritized["fallback"] = {
         "used": bool(selected_attempt.get("relaxed_roles")),
+        "attempt_key": selected_attempt.get("key", "original"),
+        "probe_counts": [
+            {"key": attempt.get("key", ""), "count": probe_counts.get(candidate_query, -1)}
+            for attempt, candidate_query in candidates
+        ],
         "relaxed_roles": selected_attempt.get("relaxed_roles", []),
         "relaxed_labels": selected_attempt.get("relaxed_labels", []),
         "original_query": pubmed_backend.apply_pubmed_date_filter(
@@ -89,22 +257,89 @@ def discover_articles(
     }
 
 
+def _analyze_question(
+    question: str,
+    *,
+    speculative: bool,
+    librarian_deadline: float,
+    prefetcher: DiscoveryPrefetcher | None,
+    use_cache: bool,
+) -> tuple:
+    if speculative:
+        librarian_analysis, legacy_result, analysis_timing = _analyze_speculatively(
+            question, librarian_deadline, prefetcher, use_cache=use_cache
+        )
+    else:
+        librarian_analysis, librarian_seconds = _timed_call(
+            get_librarian_strategy_analysis,
+            question,
+            use_cache=use_cache,
+            on_partial=prefetcher.on_librarian_field if prefetcher else None,
+        )
+        legacy_result = None
+        analysis_timing = {"mode": "sequential", "librarian_seconds": round(librarian_seconds, 3)}
+
+    if librarian_analysis:
+        result = librarian_analysis.get("result") or {}
+        query_package = librarian_analysis.get("query_package") or build_query_package(result)
+        return result, query_package, "librarian_strategy", analysis_timing
+
+    if legacy_result is None:
+        legacy_result, legacy_seconds = _timed_call(
+            analyze_research_question,
+            question,
+            use_cache=use_cache,
+            on_partial=prefetcher.on_legacy_field if prefetcher else None,
+        )
+        analysis_timing["legacy_seconds"] = round(legacy_seconds, 3)
+    return legacy_result, build_query_package(legacy_result), "legacy", analysis_timing
+
+
 def run_topic_discovery(
     question: str,
     *,
     focus_key: str = "other",
     custom_goal: str = "",
-    max_results: int = 50,
+    max_results: int | None = None,
     time_filter: dict | None = None,
+    speculative: bool = True,
+    librarian_deadline: float = SPECULATIVE_LIBRARIAN_DEADLINE,
+    prefetch: bool = True,
+    reuse_similar: bool = True,
+    force_fresh: bool = False,
 ) -> dict:
-    librarian_analysis = get_librarian_strategy_analysis(question)
+    """
+    Analyse the question, then run the initial PubMed discovery.
 
-    if librarian_analysis:
-        result = librarian_analysis.get("result") or {}
-        query_package = librarian_analysis.get("query_package") or build_query_package(result)
-    else:
-        result = analyze_research_question(question)
+    With reuse_similar, a near-duplicate of a previously analysed question (saved project
+    entries) reuses that entry's result and query package instead of calling the LLMs.
+    force_fresh skips that reuse and the LLM response cache. max_results defaults to
+    discovery_max_results().
+    """
+    max_results = max_results or discovery_max_results()
+    similar = find_similar_analysis(question) if reuse_similar and not force_fresh else None
+    if similar:
+        result = similar["entry"].get("result") or {}
         query_package = build_query_package(result)
+        strategy_source = "librarian_strategy" if result.get("librarian_strategy") else "legacy"
+        analysis_timing = {
+            "mode": "reused",
+            "reused_entry_id": similar["entry"].get("id"),
+            "reused_question": similar["entry"].get("user_question"),
+            "similarity": similar["similarity"],
+            "exact": similar["exact"],
+        }
+    else:
+        prefetcher = DiscoveryPrefetcher(question, max_results, time_filter) if prefetch else None
+        result, query_package, strategy_source, analysis_timing = _analyze_question(
+            question,
+            speculative=speculative,
+            librarian_deadline=librarian_deadline,
+            prefetcher=prefetcher,
+            use_cache=not force_fresh,
+        )
+        if prefetcher:
+            analysis_timing["prefetched_queries"] = list(prefetcher.prefetched)
 
     base_query = get_preferred_discovery_query(query_package)
     discovery = discover_articles(
@@ -120,5 +355,6 @@ def run_topic_discovery(
         "result": result,
         "query_package": query_package,
         "discovery": discovery,
-        "strategy_source": "librarian_strategy" if librarian_analysis else "legacy",
+        "strategy_source": strategy_source,
+        "analysis_timing": analysis_timing,
     }
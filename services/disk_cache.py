@@ -0,0 +1,123 @@
+"""
+Small SQLite-backed key/value cache shared across sessions and restarts.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
+
+
+def get_cache_dir() -> Path:
+    configured = os.getenv("RESEARCH_COMPANION_CACHE_DIR", "").strip()
+    return Path(configured) if configured else DEFAULT_CACHE_DIR
+
+
+class DiskCache:
+    """Single-file cache with per-entry TTL, LRU eviction by size and hit/miss counters."""
+
+    def __init__(self, path, max_bytes: int = 64 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._connection = None
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.path), timeout=5, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL"
+                ")"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None or row[1] < now:
+                    if row is not None:
+                        connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+                        connection.commit()
+                    self._counters["misses"] += 1
+                    return None
+                connection.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+                connection.commit()
+                self._counters["hits"] += 1
+                return row[0]
+            except sqlite3.Error:
+                self._counters["errors"] += 1
+                self._counters["misses"] += 1
+                return None
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, size, now + ttl, now),
+                )
+                self._counters["writes"] += 1
+                self._evict(connection, now)
+                connection.commit()
+            except sqlite3.Error:
+                self._counters["errors"] += 1
+
+    def _evict(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM entries WHERE expires_at < ?", (now,))
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        stale_keys = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+            stale_keys.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM entries WHERE key = ?", stale_keys)
+        self._counters["evictions"] += len(stale_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute("DELETE FROM entries")
+                connection.commit()
+            except sqlite3.Error:
+                self._counters["errors"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+        return counters
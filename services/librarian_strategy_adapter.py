@@ -1,11 +1,17 @@
+import functools
 import json
 from pathlib import Path
 
-from claude_helper import get_anthropic_client
-from claude_helper import get_openai_client
+from claude_helper import ANTHROPIC_MODEL
+from claude_helper import OPENAI_MODEL
+from claude_helper import complete_with_anthropic
+from claude_helper import complete_with_openai
 from claude_helper import normalize_result
 from claude_helper import parse_response
 from services.concept_classifier import ROLE_LABELS
+from services.llm_cache import cached_llm_call
+from services.llm_hedging import hedged_call
+from services.single_flight import coalesce
 
 
 SKILL_DIR = Path(__file__).resolve().parent.parent / "files_2"
@@ -60,7 +66,9 @@ def _build_examples_snippet(examples: list) -> str:
     return json.dumps(selected, ensure_ascii=False, indent=2)
 
 
-def _build_librarian_prompt(question: str) -> str:
+@functools.lru_cache(maxsize=1)
+def _build_librarian_system_prompt() -> str:
+    """Skill prompt, schema and calibration examples: static, so the provider can cache it."""
     prompt_text, examples = _load_skill_assets()
     examples_snippet = _build_examples_snippet(examples)
     return (
@@ -84,29 +92,46 @@ def _build_librarian_prompt(question: str) -> str:
         '  "notes": ["string"]\n'
         "}\n\n"
         "Use the examples below for calibration only.\n"
-        f"{examples_snippet}\n\n"
-        f'User topic: "{question}"'
+        f"{examples_snippet}"
     )
 
 
-def _call_with_anthropic(prompt: str) -> dict:
-    client = get_anthropic_client()
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1400,
-        messages=[{"role": "user", "content": prompt}],
+def _build_librarian_request(question: str) -> str:
+    return f'User topic: "{question}"'
+
+
+def _call_with_anthropic(system_prompt: str, request_prompt: str, use_cache: bool = True, on_partial=None) -> dict:
+    def call() -> dict:
+        return parse_response(
+            complete_with_anthropic("librarian_strategy", system_prompt, request_prompt, 1400, on_partial)
+        )
+
+    return cached_llm_call(
+        "librarian_strategy",
+        "anthropic",
+        ANTHROPIC_MODEL,
+        f"{system_prompt}\n\n{request_prompt}",
+        1400,
+        call,
+        use_cache=use_cache,
     )
-    return parse_response(message.content[0].text)
 
 
-def _call_with_openai(prompt: str) -> dict:
-    client = get_openai_client()
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        max_tokens=1400,
-        messages=[{"role": "user", "content": prompt}],
+def _call_with_openai(system_prompt: str, request_prompt: str, use_cache: bool = True, on_partial=None) -> dict:
+    def call() -> dict:
+        return parse_response(
+            complete_with_openai("librarian_strategy", system_prompt, request_prompt, 1400, on_partial)
+        )
+
+    return cached_llm_call(
+        "librarian_strategy",
+        "openai",
+        OPENAI_MODEL,
+        f"{system_prompt}\n\n{request_prompt}",
+        1400,
+        call,
+        use_cache=use_cache,
     )
-    return parse_response(response.choices[0].message.content)
 
 
 def _normalize_mesh_term(value: str) -> str | None:
@@ -317,17 +342,24 @@ def adapt_librarian_strategy_payload(question: str, payload: dict) -> dict | Non
     }
 
 
-def analyze_with_librarian_strategy(question: str) -> dict:
-    prompt = _build_librarian_prompt(question)
-    try:
-        return _call_with_anthropic(prompt)
-    except Exception:
-        return _call_with_openai(prompt)
+def analyze_with_librarian_strategy(question: str, use_cache: bool = True, on_partial=None) -> dict:
+    system_prompt = _build_librarian_system_prompt()
+    request_prompt = _build_librarian_request(question)
+    return hedged_call(
+        "anthropic",
+        lambda: _call_with_anthropic(system_prompt, request_prompt, use_cache=use_cache, on_partial=on_partial),
+        "openai",
+        lambda: _call_with_openai(system_prompt, request_prompt, use_cache=use_cache, on_partial=on_partial),
+    )
 
 
-def get_librarian_strategy_analysis(question: str) -> dict | None:
+@coalesce(
+    name="llm.get_librarian_strategy_analysis",
+    key=lambda question, use_cache=True, on_partial=None: f"{int(bool(use_cache))}|{' '.join(str(question or '').split())}",
+)
+def get_librarian_strategy_analysis(question: str, use_cache: bool = True, on_partial=None) -> dict | None:
     try:
-        raw_payload = analyze_with_librarian_strategy(question)
+        raw_payload = analyze_with_librarian_strategy(question, use_cache=use_cache, on_partial=on_partial)
         return adapt_librarian_strategy_payload(question, raw_payload)
     except Exception:
         return None
@@ -0,0 +1,90 @@
+"""
+Disk-backed cache of parsed LLM responses, keyed by provider, model, prompt hash and max_tokens.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+from services.disk_cache import DiskCache
+from services.disk_cache import get_cache_dir
+from services.llm_hedging import timed_provider_call
+from services.single_flight import after_flight
+
+
+LLM_CACHE_TTL = 7 * 24 * 60 * 60
+LLM_CACHE = DiskCache(get_cache_dir() / "llm_cache.sqlite3", max_bytes=64 * 1024 * 1024)
+
+_COUNTERS_LOCK = threading.Lock()
+_CALL_SITE_COUNTERS = {}
+
+
+def llm_cache_enabled() -> bool:
+    return os.getenv("RESEARCH_COMPANION_LLM_CACHE", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def build_llm_cache_key(provider: str, model: str, prompt: str, max_tokens: int) -> str:
+    prompt_hash = hashlib.sha256(str(prompt or "").encode("utf-8")).hexdigest()
+    return f"{provider}|{model}|{max_tokens}|{prompt_hash}"
+
+
+def _count(call_site: str, field: str) -> None:
+    with _COUNTERS_LOCK:
+        counters = _CALL_SITE_COUNTERS.setdefault(call_site, {"hits": 0, "misses": 0, "bypassed": 0})
+        counters[field] += 1
+
+
+def cached_llm_call(
+    call_site: str,
+    provider: str,
+    model: str,
+    prompt: str,
+    max_tokens: int,
+    fn,
+    *,
+    use_cache: bool = True,
+    ttl: float = LLM_CACHE_TTL,
+):
+    """
+    Return fn()'s parsed JSON, served from disk when the same prompt was already
+    answered by the same provider/model with the same max_tokens.
+
+    use_cache=False skips the lookup but still stores the fresh answer, so a forced
+    re-analysis replaces the cached one. Only successful, JSON-serializable results
+    are stored; exceptions propagate uncached.
+    """
+    if ttl <= 0 or not llm_cache_enabled():
+        _count(call_site, "bypassed")
+        return timed_provider_call(provider, fn)
+
+    key = build_llm_cache_key(provider, model, prompt, max_tokens)
+    if use_cache:
+        cached = LLM_CACHE.get(key)
+        if cached is not None:
+            try:
+                value = json.loads(cached)
+                _count(call_site, "hits")
+                return value
+            except ValueError:
+                pass
+        _count(call_site, "misses")
+    else:
+        _count(call_site, "bypassed")
+
+    value = timed_provider_call(provider, fn)
+    try:
+        serialized = json.dumps(value, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return value
+    after_flight(LLM_CACHE.set, key, serialized, ttl)
+    return value
+
+
+def get_llm_cache_stats() -> dict:
+    with _COUNTERS_LOCK:
+        call_sites = {name: dict(counters) for name, counters in _CALL_SITE_COUNTERS.items()}
+    for counters in call_sites.values():
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 4) if lookups else 0.0
+    return {"storage": LLM_CACHE.stats(), "call_sites": call_sites}
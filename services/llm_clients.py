@@ -0,0 +1,144 @@
+"""
+Process-wide LLM SDK clients: one client and keep-alive connection pool per provider,
+rebuilt only when the provider's API key changes.
+"""
+
+import os
+import threading
+
+import anthropic
+import openai
+import streamlit as st
+
+
+# The SDK default (5 s) drops the pool between two user actions; keep connections for a while.
+LLM_KEEPALIVE_EXPIRY = 90.0
+
+
+def llm_warmup_enabled() -> bool:
+    return os.getenv("RESEARCH_COMPANION_LLM_WARMUP", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def _configured_max_connections() -> int | None:
+    """Optional per-provider connection cap; unset keeps the SDK defaults (1000, 100 kept alive)."""
+    try:
+        value = int(os.getenv("RESEARCH_COMPANION_LLM_MAX_CONNECTIONS", "") or 0)
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def read_api_key(name: str) -> str:
+    try:
+        return st.secrets[name].strip()
+    except Exception:
+        return os.getenv(name, "").strip()
+
+
+def _connection_limits(sdk):
+    # Built from the SDK's own Limits type so the pool settings follow its HTTP backend.
+    defaults = sdk.DEFAULT_CONNECTION_LIMITS
+    max_connections = _configured_max_connections()
+    if max_connections is None:
+        max_connections = defaults.max_connections
+        max_keepalive_connections = defaults.max_keepalive_connections
+    else:
+        max_keepalive_connections = min(defaults.max_keepalive_connections, max_connections)
+    return type(defaults)(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+    )
+
+
+def _build_anthropic_client(api_key: str):
+    return anthropic.Anthropic(
+        api_key=api_key,
+        http_client=anthropic.DefaultHttpxClient(limits=_connection_limits(anthropic)),
+    )
+
+
+def _build_openai_client(api_key: str):
+    return openai.OpenAI(
+        api_key=api_key,
+        http_client=openai.DefaultHttpxClient(limits=_connection_limits(openai)),
+    )
+
+
+class LLMClientRegistry:
+    def __init__(self, providers: dict):
+        self._providers = providers
+        self._lock = threading.Lock()
+        self._clients = {}
+        self._counters = {"created": 0, "reused": 0, "rebuilt_on_key_change": 0}
+        self._warmed = set()
+
+    def get(self, provider: str):
+        """Shared client for provider; a new one is built only on first use or after a key change."""
+        secret_name, factory = self._providers[provider]
+        api_key = read_api_key(secret_name)
+        with self._lock:
+            entry = self._clients.get(provider)
+            if entry is not None and entry[0] == api_key:
+                self._counters["reused"] += 1
+                return entry[1]
+            # The previous client is not closed: other threads may still be streaming through it.
+            client = factory(api_key)
+            self._clients[provider] = (api_key, client)
+            self._counters["created"] += 1
+            if entry is not None:
+                self._counters["rebuilt_on_key_change"] += 1
+            return client
+
+    def warm(self, provider: str) -> bool:
+        """Open a pooled TLS connection with a cheap authenticated request (model listing)."""
+        secret_name, _ = self._providers[provider]
+        if not read_api_key(secret_name):
+            return False
+        try:
+            self.get(provider).models.list()
+        except Exception:
+            return False
+        with self._lock:
+            self._warmed.add(provider)
+        return True
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "providers": sorted(self._clients), "warmed": sorted(self._warmed)}
+
+
+LLM_CLIENTS = LLMClientRegistry(
+    {
+        "anthropic": ("ANTHROPIC_API_KEY", _build_anthropic_client),
+        "openai": ("OPENAI_API_KEY", _build_openai_client),
+    }
+)
+
+_WARMUP_LOCK = threading.Lock()
+_WARMUP_STARTED = False
+
+
+def warm_llm_clients() -> bool:
+    """
+    Pre-open provider connections in the background, once per process. Safe to call on
+    every Streamlit rerun; returns True only for the call that started the warm-up.
+    """
+    global _WARMUP_STARTED
+    if not llm_warmup_enabled():
+        return False
+    with _WARMUP_LOCK:
+        if _WARMUP_STARTED:
+            return False
+        _WARMUP_STARTED = True
+
+    def warm_all() -> None:
+        for provider in ("anthropic", "openai"):
+            LLM_CLIENTS.warm(provider)
+
+    threading.Thread(target=warm_all, name="llm-warmup", daemon=True).start()
+    return True
+
+
+def get_llm_client_stats() -> dict:
+    return LLM_CLIENTS.stats()
@@ -0,0 +1,201 @@
+"""
+Hedged LLM provider calls: start the fallback provider once the primary is slower than usual.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+from services.single_flight import collect_deferred
+from services.single_flight import run_deferred
+
+
+HEDGE_PERCENTILE = 0.9
+# Below this many samples there is no latency estimate: calls only fall back on failure.
+HEDGE_MIN_SAMPLES = 5
+HEDGE_MIN_DELAY = 1.0
+HEDGE_MAX_DELAY = 20.0
+LATENCY_WINDOW = 200
+
+
+def llm_hedging_enabled() -> bool:
+    return os.getenv("RESEARCH_COMPANION_LLM_HEDGING", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def _configured_percentile() -> float:
+    try:
+        value = float(os.getenv("RESEARCH_COMPANION_HEDGE_PERCENTILE", HEDGE_PERCENTILE))
+    except ValueError:
+        return HEDGE_PERCENTILE
+    return min(max(value, 0.5), 0.99)
+
+
+class LatencyHistogram:
+    """Sliding window of successful call latencies for one provider."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(float(seconds))
+
+    def percentile(self, fraction: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, round(fraction * (len(samples) - 1))))
+        return samples[index]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._samples)
+
+
+class HedgeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._counters = {"calls": 0, "hedged": 0, "wins": {}}
+
+    def histogram(self, provider: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._latencies.get(provider)
+            if histogram is None:
+                histogram = LatencyHistogram()
+                self._latencies[provider] = histogram
+            return histogram
+
+    def count_call(self, hedged: bool, winner: str | None) -> None:
+        with self._lock:
+            self._counters["calls"] += 1
+            if hedged:
+                self._counters["hedged"] += 1
+            if winner:
+                self._counters["wins"][winner] = self._counters["wins"].get(winner, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = {**self._counters, "wins": dict(self._counters["wins"])}
+            providers = list(self._latencies.items())
+        counters["latency"] = {
+            provider: {
+                "samples": len(histogram),
+                "p50": histogram.percentile(0.5),
+                "p90": histogram.percentile(0.9),
+            }
+            for provider, histogram in providers
+        }
+        return counters
+
+
+HEDGE_STATS = HedgeStats()
+
+
+def record_provider_latency(provider: str, seconds: float) -> None:
+    HEDGE_STATS.histogram(provider).record(seconds)
+
+
+def timed_provider_call(provider: str, fn):
+    """Run a real provider request and feed its latency to the provider's histogram."""
+    started = time.monotonic()
+    value = fn()
+    record_provider_latency(provider, time.monotonic() - started)
+    return value
+
+
+def hedge_delay(provider: str, percentile: float = None) -> float | None:
+    """
+    Seconds to wait on `provider` before starting the fallback: its latency percentile,
+    clamped. None until the histogram holds HEDGE_MIN_SAMPLES samples.
+    """
+    histogram = HEDGE_STATS.histogram(provider)
+    if len(histogram) < HEDGE_MIN_SAMPLES:
+        return None
+    observed = histogram.percentile(percentile or _configured_percentile())
+    return min(max(observed, HEDGE_MIN_DELAY), HEDGE_MAX_DELAY)
+
+
+def _start_call(provider: str, fn, results: queue.Queue) -> None:
+    """
+    Run fn on its own daemon thread and return once it has started; the outcome goes to
+    results. The thread's after_flight writes travel with the outcome instead of running
+    there, so only the winner's writes happen, deferred on the caller's thread.
+    """
+    started = threading.Event()
+
+    def run() -> None:
+        started.set()
+        try:
+            results.put((provider, collect_deferred(fn), None))
+        except Exception as error:
+            results.put((provider, (None, []), error))
+
+    threading.Thread(target=run, name=f"llm-hedge-{provider}", daemon=True).start()
+    started.wait()
+
+
+def _sequential_call(primary_provider: str, primary_fn, secondary_provider: str, secondary_fn):
+    try:
+        result = primary_fn()
+        HEDGE_STATS.count_call(False, primary_provider)
+        return result
+    except Exception:
+        result = secondary_fn()
+        HEDGE_STATS.count_call(False, secondary_provider)
+        return result
+
+
+def hedged_call(primary_provider: str, primary_fn, secondary_provider: str, secondary_fn, percentile: float = None):
+    """
+    Return the first successful result of primary_fn / secondary_fn.
+
+    The secondary starts as soon as the primary fails, or once the primary has run
+    longer than its latency percentile, counted from when it actually started. Each
+    call gets its own threads, so concurrent sessions never queue behind each other;
+    the slower call is left to finish in the background and its result and cache writes
+    are ignored.
+    With hedging disabled, or before the primary has enough latency samples, this is
+    the plain sequential fallback on the caller's thread. If both fail, the last
+    error is raised.
+    """
+    delay = hedge_delay(primary_provider, percentile) if llm_hedging_enabled() else None
+    if delay is None:
+        return _sequential_call(primary_provider, primary_fn, secondary_provider, secondary_fn)
+
+    results = queue.Queue()
+    _start_call(primary_provider, primary_fn, results)
+    pending = 1
+    hedged = False
+    last_error = None
+    timeout = delay
+    while True:
+        try:
+            provider, (result, deferred), error = results.get(timeout=timeout)
+        except queue.Empty:
+            provider = None
+        if provider is not None:
+            pending -= 1
+            if error is None:
+                HEDGE_STATS.count_call(hedged, provider)
+                run_deferred(deferred)
+                return result
+            last_error = error
+
+        if not hedged:
+            hedged = True
+            timeout = None
+            _start_call(secondary_provider, secondary_fn, results)
+            pending += 1
+            continue
+        if not pending:
+            HEDGE_STATS.count_call(hedged, None)
+            raise last_error
+
+
+def get_hedge_stats() -> dict:
+    return HEDGE_STATS.snapshot()
@@ -0,0 +1,123 @@
+"""
+Streamed LLM completions with incremental JSON extraction: top-level fields are handed
+to a callback as soon as their value is complete, while the rest is still generating.
+"""
+
+import json
+import os
+import time
+
+from services.llm_usage import anthropic_usage
+from services.llm_usage import openai_usage
+
+
+def llm_streaming_enabled() -> bool:
+    return os.getenv("RESEARCH_COMPANION_LLM_STREAMING", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+class IncrementalJSONObject:
+    """
+    Feed-as-you-go scanner for one top-level JSON object.
+
+    Tracks string/escape state and nesting depth; each time a top-level member ends
+    (a comma or the closing brace at depth 1) that member alone is decoded. Text before
+    the first brace, such as a ```json fence, is ignored.
+    """
+
+    def __init__(self):
+        self.fields = {}
+        self.done = False
+        self._text = ""
+        self._position = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+        self._member_start = 0
+
+    def feed(self, chunk: str) -> list:
+        """Consume a chunk and return the keys whose values completed within it."""
+        self._text += chunk
+        text = self._text
+        completed = []
+        index = self._position
+        while index < len(text) and not self.done:
+            char = text[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif not self._started:
+                if char == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = index + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_member(text[self._member_start:index], completed)
+                    self.done = True
+            elif char == "," and self._depth == 1:
+                self._close_member(text[self._member_start:index], completed)
+                self._member_start = index + 1
+            index += 1
+        self._position = index
+        return completed
+
+    def _close_member(self, member: str, completed: list) -> None:
+        member = member.strip()
+        if not member:
+            return
+        try:
+            parsed = json.loads("{" + member + "}")
+        except ValueError:
+            return
+        for key, value in parsed.items():
+            self.fields[key] = value
+            completed.append(key)
+
+
+def iter_anthropic_text(client, request: dict, usage: dict):
+    """Yield text deltas of a Messages request; `usage` is filled from the final message."""
+    with client.messages.stream(**request) as stream:
+        yield from stream.text_stream
+        usage.update(anthropic_usage(stream.get_final_message().usage))
+
+
+def iter_openai_text(client, request: dict, usage: dict):
+    """Yield text deltas of a chat completion; `usage` is filled from the closing usage chunk."""
+    for chunk in client.chat.completions.create(**request, stream=True, stream_options={"include_usage": True}):
+        if getattr(chunk, "usage", None):
+            usage.update(openai_usage(chunk.usage))
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+def collect_streamed_json(chunks, on_partial=None) -> tuple:
+    """
+    Join a text stream, calling on_partial(fields_so_far, key) whenever a top-level
+    field completes. Returns the full text and the monotonic time of the first chunk.
+    """
+    scanner = IncrementalJSONObject() if on_partial is not None else None
+    parts = []
+    first_chunk_at = None
+    for chunk in chunks:
+        if first_chunk_at is None:
+            first_chunk_at = time.monotonic()
+        parts.append(chunk)
+        if scanner is None:
+            continue
+        for key in scanner.feed(chunk):
+            try:
+                on_partial(dict(scanner.fields), key)
+            except Exception:
+                # Early work is opportunistic; it must never break the analysis itself.
+                pass
+    return "".join(parts), first_chunk_at
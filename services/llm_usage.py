@@ -0,0 +1,107 @@
+"""
+Per-call LLM usage: cached vs uncached input tokens, time to first token and prompt
+tokens saved by abstract compression, by call site.
+"""
+
+import threading
+from collections import deque
+
+
+RECENT_CALLS = 100
+
+_LOCK = threading.Lock()
+_TOTALS = {}
+_RECENT = deque(maxlen=RECENT_CALLS)
+_COMPRESSION = {}
+
+
+def anthropic_usage(usage) -> dict:
+    """Anthropic reports cache reads and cache writes apart from the remaining input tokens."""
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    return {
+        "cached_input_tokens": cache_read,
+        "uncached_input_tokens": (getattr(usage, "input_tokens", 0) or 0) + cache_write,
+        "cache_write_tokens": cache_write,
+        "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+    }
+
+
+def openai_usage(usage) -> dict:
+    """OpenAI caches long prefixes automatically and reports the reused part of prompt_tokens."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", 0) or 0
+    return {
+        "cached_input_tokens": cached,
+        "uncached_input_tokens": max(0, (getattr(usage, "prompt_tokens", 0) or 0) - cached),
+        "cache_write_tokens": 0,
+        "output_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+
+
+def record_llm_usage(
+    call_site: str,
+    provider: str,
+    usage: dict,
+    *,
+    ttft_seconds: float | None = None,
+    latency_seconds: float | None = None,
+) -> None:
+    record = {
+        "call_site": call_site,
+        "provider": provider,
+        "cached_input_tokens": int(usage.get("cached_input_tokens", 0)),
+        "uncached_input_tokens": int(usage.get("uncached_input_tokens", 0)),
+        "cache_write_tokens": int(usage.get("cache_write_tokens", 0)),
+        "output_tokens": int(usage.get("output_tokens", 0)),
+        "ttft_seconds": round(ttft_seconds, 3) if ttft_seconds is not None else None,
+        "latency_seconds": round(latency_seconds, 3) if latency_seconds is not None else None,
+    }
+    with _LOCK:
+        _RECENT.append(record)
+        totals = _TOTALS.setdefault(
+            (call_site, provider),
+            {
+                "calls": 0,
+                "cached_input_tokens": 0,
+                "uncached_input_tokens": 0,
+                "cache_write_tokens": 0,
+                "output_tokens": 0,
+                "ttft_total": 0.0,
+                "ttft_calls": 0,
+            },
+        )
+        totals["calls"] += 1
+        for field in ("cached_input_tokens", "uncached_input_tokens", "cache_write_tokens", "output_tokens"):
+            totals[field] += record[field]
+        if ttft_seconds is not None:
+            totals["ttft_total"] += ttft_seconds
+            totals["ttft_calls"] += 1
+
+
+def record_prompt_compression(call_site: str, stats: dict) -> None:
+    with _LOCK:
+        totals = _COMPRESSION.setdefault(
+            call_site,
+            {"prompts": 0, "original_tokens": 0, "compressed_tokens": 0, "tokens_saved": 0, "last_tokens_saved": 0},
+        )
+        totals["prompts"] += 1
+        for field in ("original_tokens", "compressed_tokens", "tokens_saved"):
+            totals[field] += int(stats.get(field, 0))
+        totals["last_tokens_saved"] = int(stats.get("tokens_saved", 0))
+
+
+def get_llm_usage_stats() -> dict:
+    with _LOCK:
+        totals = {key: dict(value) for key, value in _TOTALS.items()}
+        recent = list(_RECENT)
+        compression = {key: dict(value) for key, value in _COMPRESSION.items()}
+    call_sites = {}
+    for (call_site, provider), value in totals.items():
+        input_tokens = value["cached_input_tokens"] + value["uncached_input_tokens"]
+        ttft_total = value.pop("ttft_total")
+        ttft_calls = value.pop("ttft_calls")
+        value["cached_input_ratio"] = round(value["cached_input_tokens"] / input_tokens, 4) if input_tokens else 0.0
+        value["mean_ttft_seconds"] = round(ttft_total / ttft_calls, 3) if ttft_calls else None
+        call_sites.setdefault(call_site, {})[provider] = value
+    return {"call_sites": call_sites, "recent": recent, "compression": compression}
@@ -0,0 +1,112 @@
+"""
+Index of previously analysed questions (saved project entries).
+
+Questions are accent-folded and reduced to their content tokens. Two questions match when
+they have exactly the same set of content tokens, so only accents, case, punctuation,
+stopwords and word order may differ: a dropped or added concept (population, subtype...)
+is a different question. The index is a plain dict keyed on that token set.
+"""
+
+import re
+import threading
+import unicodedata
+from copy import deepcopy
+
+from research_projects import PROJECTS_PATH
+from research_projects import load_projects
+
+
+QUESTION_STOPWORDS = {
+    "a", "au", "aux", "avec", "ce", "ces", "chez", "dans", "de", "des", "du", "en", "est", "et",
+    "il", "la", "le", "les", "leur", "leurs", "ou", "par", "pour", "quel", "quelle", "quels",
+    "qu", "que", "sur", "un", "une", "y", "etudes", "etude",
+    "an", "and", "are", "among", "any", "for", "from", "in", "is", "of", "on", "or", "the",
+    "there", "to", "what", "with", "study", "studies",
+}
+
+
+def fold_text(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", str(text or "").lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def question_tokens(text: str) -> tuple:
+    """Accent-folded content tokens, in order."""
+    return tuple(
+        token
+        for token in re.findall(r"[a-z0-9]+", fold_text(text))
+        if len(token) > 1 and token not in QUESTION_STOPWORDS
+    )
+
+
+class QuestionIndex:
+    """Saved entries keyed on their question's content-token set; rebuilt when the projects file changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
+
+    def _projects_version(self):
+        try:
+            stat = PROJECTS_PATH.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _rebuild(self, projects: list) -> None:
+        entries = {}
+        for project in projects or []:
+            for entry in project.get("entries", []) or []:
+                question = str(entry.get("user_question") or "").strip()
+                if not question or not isinstance(entry.get("result"), dict):
+                    continue
+                tokens = question_tokens(question)
+                if not tokens:
+                    continue
+                entries.setdefault(frozenset(tokens), []).append(
+                    (tokens, {**entry, "project_id": project.get("id"), "project_title": project.get("title")})
+                )
+        self._entries = entries
+
+    def refresh(self, projects: list | None = None) -> None:
+        with self._lock:
+            if projects is not None:
+                self._rebuild(projects)
+                self._version = ("explicit", id(projects))
+                return
+            version = self._projects_version()
+            if version != self._version:
+                self._rebuild(load_projects())
+                self._version = version
+
+    def find(self, question: str) -> dict | None:
+        tokens = question_tokens(str(question or "").strip())
+        if not tokens:
+            return None
+        with self._lock:
+            candidates = self._entries.get(frozenset(tokens), ())
+
+        # Same word order first, then the most recent entry.
+        best = max(candidates, key=lambda item: (item[0] == tokens, item[1].get("created_at", "")), default=None)
+        if best is None:
+            return None
+        stored_tokens, entry = best
+        # Callers get their own copy: the indexed entry must survive later edits of the result.
+        return {"entry": deepcopy(entry), "similarity": 1.0, "exact": stored_tokens == tokens}
+
+
+QUESTION_INDEX = QuestionIndex()
+
+
+def find_similar_analysis(question: str) -> dict | None:
+    """
+    Previously analysed entry with the same content tokens, as {"entry", "similarity",
+    "exact"}, or None. similarity is always 1.0; exact is False when only the word order
+    differs. Never raises: a broken projects file simply means no reuse.
+    """
+    try:
+        QUESTION_INDEX.refresh()
+        return QUESTION_INDEX.find(question)
+    except Exception:
+        return None
@@ -1,6 +1,9 @@
+import functools
+import json
 import re
 
 from services.concept_classifier import classify_concept_role
+from services.term_matcher import get_term_matcher
 
 
 ROLE_WEIGHTS = {
@@ -15,15 +18,6 @@ def _normalize(text: str) -> str:
     return str(text or "").strip().lower()
 
 
-def _contains_term(text: str, term: str) -> bool:
-    normalized_text = _normalize(text)
-    normalized_term = _normalize(term)
-    if not normalized_text or not normalized_term:
-        return False
-    pattern = r"(?<!\w)" + re.escape(normalized_term) + r"(?!\w)"
-    return re.search(pattern, normalized_text) is not None
-
-
 def _split_terms(value: str) -> list:
     terms = re.split(r"\s+OR\s+", str(value or ""))
     cleaned = []
@@ -74,7 +68,35 @@ def _extract_detected_concepts(result: dict) -> list:
     return concepts
 
 
-def score_article_against_detected_concepts(article: dict, result: dict) -> dict:
+class ConceptProfile:
+    """Detected concepts of one result (roles, split terms) with their compiled term matcher."""
+
+    __slots__ = ("concepts", "matcher")
+
+    def __init__(self, concepts: list):
+        self.concepts = concepts
+        self.matcher = get_term_matcher({index: concept["terms"] for index, concept in enumerate(concepts)})
+
+
+def _concept_signature(result: dict) -> str:
+    elements = [element for element in ((result or {}).get("search_elements") or []) if isinstance(element, dict)]
+    return json.dumps(elements, sort_keys=True, ensure_ascii=False, default=str)
+
+
+@functools.lru_cache(maxsize=64)
+def _build_concept_profile(signature: str) -> ConceptProfile:
+    return ConceptProfile(_extract_detected_concepts({"search_elements": json.loads(signature)}))
+
+
+def get_concept_profile(result: dict) -> ConceptProfile:
+    """Concept profile memoized on the result's search elements."""
+    return _build_concept_profile(_concept_signature(result))
+
+
+def score_article_against_detected_concepts(article: dict, result: dict = None, profile: ConceptProfile = None) -> dict:
+    if profile is None:
+        profile = get_concept_profile(result)
+
     haystack = " ".join(
         part for part in [
             article.get("title", ""),
@@ -87,8 +109,9 @@ def score_article_against_detected_concepts(article: dict, result: dict) -> dict
     reasons = []
     score = 0.0
 
-    for concept in _extract_detected_concepts(result):
-        matched_terms = [term for term in concept["terms"] if _contains_term(haystack, term)]
+    matched = profile.matcher.scan(haystack)
+    for index, concept in enumerate(profile.concepts):
+        matched_terms = matched.get(index)
         if not matched_terms:
             continue
         matched_by_role[concept["role"]].append({
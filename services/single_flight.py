@@ -0,0 +1,141 @@
+"""
+Process-wide request coalescing: identical concurrent calls share one in-flight execution.
+"""
+
+import functools
+import json
+import threading
+from copy import deepcopy
+
+
+_LOCAL = threading.local()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+def after_flight(fn, *args, **kwargs) -> None:
+    """
+    Run fn once the enclosing coalesced call has released its waiters, or right away
+    outside one. Cache writes go through here so followers never wait on them; nested
+    flights hand their deferred work to the outermost one.
+    """
+    deferred = getattr(_LOCAL, "deferred", None)
+    if deferred is None:
+        fn(*args, **kwargs)
+        return
+    deferred.append((fn, args, kwargs))
+
+
+def collect_deferred(fn, *args, **kwargs) -> tuple:
+    """
+    Run fn with its after_flight work collected rather than run, and return
+    (value, deferred). Helper threads use this so a coalesced caller can take over
+    their writes with run_deferred.
+    """
+    previous = getattr(_LOCAL, "deferred", None)
+    deferred = []
+    _LOCAL.deferred = deferred
+    try:
+        return fn(*args, **kwargs), deferred
+    finally:
+        _LOCAL.deferred = previous
+
+
+def run_deferred(deferred: list) -> None:
+    """Hand work collected by collect_deferred to the current thread's after_flight."""
+    for fn, args, kwargs in deferred:
+        after_flight(fn, *args, **kwargs)
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {}
+
+    def _count(self, name: str, field: str) -> None:
+        counters = self._counters.setdefault(name, {"executed": 0, "coalesced": 0})
+        counters[field] += 1
+
+    def do(self, name: str, key: str, fn, *args, **kwargs):
+        """Run fn once per (name, key) at a time; concurrent callers wait and get a copy of its result."""
+        call_key = (name, key)
+        with self._lock:
+            call = self._calls.get(call_key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[call_key] = call
+            else:
+                call.waiters += 1
+            self._count(name, "executed" if leader else "coalesced")
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return deepcopy(call.result)
+
+        outer_deferred = getattr(_LOCAL, "deferred", None)
+        deferred = []
+        _LOCAL.deferred = deferred
+        result = None
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            _LOCAL.deferred = outer_deferred
+            with self._lock:
+                self._calls.pop(call_key, None)
+                waiters = call.waiters
+            if waiters and call.error is None:
+                # Waiters copy from a private snapshot, never from the object the leader returns.
+                call.result = deepcopy(result)
+            call.event.set()
+            if outer_deferred is not None:
+                outer_deferred.extend(deferred)
+            else:
+                for deferred_fn, deferred_args, deferred_kwargs in deferred:
+                    deferred_fn(*deferred_args, **deferred_kwargs)
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: dict(counters) for name, counters in self._counters.items()}
+
+
+SINGLE_FLIGHT = SingleFlight()
+
+
+def _default_key(*args, **kwargs) -> str:
+    return json.dumps([args, kwargs], sort_keys=True, ensure_ascii=False, default=str)
+
+
+def coalesce(name: str = None, key=None):
+    """Decorator sharing one in-flight call between concurrent callers with the same canonical key."""
+    key_fn = key or _default_key
+
+    def decorator(fn):
+        flight_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return SINGLE_FLIGHT.do(flight_name, key_fn(*args, **kwargs), fn, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_single_flight_stats() -> dict:
+    return SINGLE_FLIGHT.stats()
@@ -0,0 +1,85 @@
+"""
+Compiled multi-term matcher: one regex scan per text finds every whole-word term occurrence.
+"""
+
+import functools
+import re
+
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _normalize(text: str) -> str:
+    return str(text or "").strip().lower()
+
+
+class TermMatcher:
+    """
+    Matches many terms at once with the same semantics as a per-term
+    `(?<!\\w)term(?!\\w)` search on lowercased text.
+
+    The alternation sits in a lookahead so matches may overlap, and is ordered
+    longest first; shorter terms that end on a word boundary inside a longer
+    match at the same position are added from a precomputed prefix table.
+    """
+
+    def __init__(self, groups: dict):
+        self.groups = {
+            group: [term for term in terms if _normalize(term)]
+            for group, terms in (groups or {}).items()
+        }
+        terms = sorted(
+            {_normalize(term) for terms in self.groups.values() for term in terms},
+            key=len,
+            reverse=True,
+        )
+        self._prefixes = {
+            term: [
+                other
+                for other in terms
+                if len(other) < len(term) and term.startswith(other) and not _WORD_CHAR.match(term[len(other)])
+            ]
+            for term in terms
+        }
+        self._pattern = (
+            re.compile(r"(?=(?<!\w)(" + "|".join(re.escape(term) for term in terms) + r")(?!\w))")
+            if terms
+            else None
+        )
+
+    def matches(self, text: str) -> set:
+        """Normalized terms occurring in text as whole words."""
+        if self._pattern is None:
+            return set()
+        normalized_text = _normalize(text)
+        if not normalized_text:
+            return set()
+        found = set()
+        for match in self._pattern.finditer(normalized_text):
+            term = match.group(1)
+            if term not in found:
+                found.add(term)
+                found.update(self._prefixes[term])
+        return found
+
+    def scan(self, text: str) -> dict:
+        """Matched terms of each group, in the group's original order and spelling."""
+        found = self.matches(text)
+        if not found:
+            return {}
+        grouped = {}
+        for group, terms in self.groups.items():
+            matched = [term for term in terms if _normalize(term) in found]
+            if matched:
+                grouped[group] = matched
+        return grouped
+
+
+@functools.lru_cache(maxsize=128)
+def _build_term_matcher(groups: tuple) -> TermMatcher:
+    return TermMatcher({group: list(terms) for group, terms in groups})
+
+
+def get_term_matcher(groups: dict) -> TermMatcher:
+    """Compiled matcher for {group: [terms]}, memoized on the groups and terms."""
+    return _build_term_matcher(tuple((group, tuple(str(term or "") for term in terms)) for group, terms in (groups or {}).items()))
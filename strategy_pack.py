@@ -2,6 +2,7 @@
 Utilitaires de formatage pour le pack exporté de stratégie de recherche.
 """
 
+from platform_backends.pubmed_backend import resolve_count
 from question_display import get_component_label
 from question_display import get_question_presentation
 from question_display import get_reformulated_question
@@ -64,8 +65,8 @@ def _format_platform_queries(platform_outputs: dict, is_identical: bool) -> str:
         strict = output.get("strict", {})
 
         lines = [f"### {platform_name}"]
-        large_count = large.get("count")
-        strict_count = strict.get("count")
+        large_count = resolve_count(large.get("count"))
+        strict_count = resolve_count(strict.get("count"))
 
         lines.append("**Stratégie large**")
         if isinstance(large_count, int) and large_count >= 0:
@@ -101,8 +102,8 @@ def _format_methodology_summary(
 
     counts = []
     for platform_name, output in platform_outputs.items():
-        large_count = output.get("large", {}).get("count")
-        strict_count = output.get("strict", {}).get("count")
+        large_count = resolve_count(output.get("large", {}).get("count"))
+        strict_count = resolve_count(output.get("strict", {}).get("count"))
         if isinstance(large_count, int) and large_count >= 0:
             if strategy.get("is_identical"):
                 counts.append(f"Sur {platform_name}, la stratégie visible renvoie {large_count} résultats.")